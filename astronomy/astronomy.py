@@ -2,20 +2,39 @@
 """Moon phase, illumination, and sunrise/sunset from Open-Meteo."""
 
 import argparse
+import atexit
+import gzip
+import hashlib
+import http.client
 import json
 import math
 import os
 import sys
+import threading
 import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 
 TIMEOUT = 10
+MAX_REDIRECTS = 5
+GEOCODE_URL_FMT = "https://geocoding-api.open-meteo.com/v1/search?name=%s&count=1&language=en&format=json"
+SUN_URL_FMT = (
+    "https://api.open-meteo.com/v1/forecast?latitude=%s&longitude=%s"
+    "&daily=sunrise,sunset&timezone=auto&start_date=%s&end_date=%s"
+)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "openclaw-astronomy")
+
+# Keep-alive connections reused across requests, keyed by (scheme, host, port).
+# http.client connections are not thread-safe, so each thread owns its pool.
+_LOCAL = threading.local()
+_ALL_POOLS = []
+_POOLS_LOCK = threading.Lock()
 
 # Known new moon epoch and synodic period
 NEW_MOON_EPOCH = date(2000, 1, 6)  # known new moon
 SYNODIC_PERIOD = 29.53058867
+PHASE_SCALE = 8 / SYNODIC_PERIOD
 
 PHASE_NAMES = [
     "New Moon",
@@ -32,68 +51,208 @@ PHASE_NAMES = [
 def load_env():
     """Load .env from the script's directory."""
     env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-    if not os.path.isfile(env_path):
+    try:
+        with open(env_path, "rb") as f:
+            data = f.read().decode("utf-8", "replace")
+    except OSError:
         return
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, _, val = line.partition("=")
-            key = key.strip()
-            val = val.strip()
-            if not os.environ.get(key):
-                os.environ[key] = val
+    # reversed() so the first occurrence of a repeated key wins, as before.
+    os.environ.update({k: v for k, v in reversed(parse_env(data)) if not os.environ.get(k)})
+
+
+def parse_env(data):
+    """Parse KEY=VALUE lines from .env text into (key, value) pairs."""
+    items = []
+    for line in data.splitlines():
+        line = line.strip()
+        if not line or line[0] == "#" or "=" not in line:
+            continue
+        key, _, val = line.partition("=")
+        items.append((key.strip(), val.strip()))
+    return items
+
+
+def _pool():
+    pool = getattr(_LOCAL, "pool", None)
+    if pool is None:
+        pool = _LOCAL.pool = {}
+        with _POOLS_LOCK:
+            _ALL_POOLS.append(pool)
+    return pool
+
+
+def _get_conn(key):
+    pool = _pool()
+    conn = pool.get(key)
+    if conn is None:
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(host, port, timeout=TIMEOUT)
+        pool[key] = conn
+    return conn
+
+
+def _drop_conn(key):
+    conn = _pool().pop(key, None)
+    if conn is not None:
+        conn.close()
+
+
+def _close_pool():
+    with _POOLS_LOCK:
+        for pool in _ALL_POOLS:
+            for conn in pool.values():
+                conn.close()
+            pool.clear()
+
+
+atexit.register(_close_pool)
 
 
 def fetch_json(url):
-    req = urllib.request.Request(url)
-    with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-        return json.loads(resp.read().decode())
+    headers = {"Connection": "keep-alive", "Accept-Encoding": "gzip"}
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise urllib.error.URLError(f"unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = f"{parts.path or '/'}?{parts.query}" if parts.query else (parts.path or "/")
+        for attempt in range(2):
+            conn = _get_conn(key)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                break
+            except (http.client.BadStatusLine, http.client.ImproperConnectionState,
+                    ConnectionResetError, BrokenPipeError) as e:
+                # Stale pooled connection; reconnect once.
+                _drop_conn(key)
+                if attempt:
+                    raise urllib.error.URLError(e) from e
+            except (OSError, http.client.HTTPException) as e:
+                _drop_conn(key)
+                raise urllib.error.URLError(e) from e
+        if resp.status in {301, 302, 303, 307, 308} and resp.getheader("Location"):
+            url = urllib.parse.urljoin(url, resp.getheader("Location"))
+            continue
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        if (resp.getheader("Content-Encoding") or "").strip().lower() == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body.decode())
+    raise urllib.error.URLError(f"too many redirects: {url}")
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+def _cache_get(key):
+    try:
+        with open(_cache_path(key)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_set(key, obj):
+    path = _cache_path(key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(obj, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
 
+def _geocode_url(query):
+    return GEOCODE_URL_FMT % urllib.parse.quote_from_bytes(query.strip().encode())
 
-def geocode(location):
-    """Geocode a city/state string to (lat, lon, display_name)."""
+
+def geocode(location, refresh=False):
+    """Geocode a city/state string to (lat, lon, display_name).
+
+    Results are cached on disk; pass refresh=True to bypass the cached value.
+    """
+    cache_key = f"geocode:{location}"
+    if not refresh:
+        hit = _cache_get(cache_key)
+        if hit:
+            return tuple(hit)
     candidates = [location, location.replace(",", " ")]
     city = location.split(",")[0].strip()
     if city != location:
         candidates.append(city)
 
-    for query in candidates:
-        encoded = urllib.parse.quote(query.strip())
-        url = f"https://geocoding-api.open-meteo.com/v1/search?name={encoded}&count=1&language=en&format=json"
-        data = fetch_json(url)
-        results = data.get("results")
-        if results:
-            r = results[0]
-            name = ", ".join(
-                x for x in [r.get("name"), r.get("admin1"), r.get("country_code")] if x
-            )
-            return r["latitude"], r["longitude"], name
-    return None
+    # The raw location usually matches; only on a miss are the fallbacks
+    # queried, concurrently. The first hit in candidate order wins, and a
+    # failed fallback only propagates when no candidate has results.
+    data = fetch_json(_geocode_url(candidates[0]))
+    if not data.get("results") and len(candidates) > 1:
+        error = None
+        with ThreadPoolExecutor(len(candidates) - 1) as ex:
+            futures = [ex.submit(fetch_json, _geocode_url(q)) for q in candidates[1:]]
+            for fut in futures:
+                try:
+                    data = fut.result()
+                except (OSError, ValueError) as e:
+                    error = error or e
+                    continue
+                if data.get("results"):
+                    break
+            else:
+                if error is not None:
+                    raise error
+                return None
+
+    results = data.get("results")
+    if not results:
+        return None
+    r = results[0]
+    name = ", ".join(
+        x for x in [r.get("name"), r.get("admin1"), r.get("country_code")] if x
+    )
+    geo = (r["latitude"], r["longitude"], name)
+    _cache_set(cache_key, list(geo))
+    return geo
 
 
 def resolve_date(val):
+    """Resolve 'yesterday', 'today', or YYYY-MM-DD to a date."""
     if val == "yesterday":
-        return (date.today() - timedelta(days=1)).isoformat()
+        return date.today() - timedelta(days=1)
     if val == "today":
-        return date.today().isoformat()
-    date.fromisoformat(val)
-    return val
+        return date.today()
+    return date.fromisoformat(val)
+
+
+def _days_since_epoch(d):
+    """Accept a date or an ISO date string."""
+    if not isinstance(d, date):
+        d = date.fromisoformat(d)
+    return (d - NEW_MOON_EPOCH).days
+
+
+def _fraction_for_days(days_since):
+    return (days_since % SYNODIC_PERIOD) / SYNODIC_PERIOD
 
 
 def moon_phase_fraction(date_str):
     """Return phase as a fraction of the synodic cycle (0.0 = new moon, 0.5 = full)."""
-    d = date.fromisoformat(date_str)
-    days_since = (d - NEW_MOON_EPOCH).days
-    return (days_since % SYNODIC_PERIOD) / SYNODIC_PERIOD
+    return _fraction_for_days(_days_since_epoch(date_str))
+
+
+def _phase_index_for_days(days_since):
+    # round(8 * frac) wrapped to 0..7, without the divide and float modulo.
+    return int((days_since % SYNODIC_PERIOD) * PHASE_SCALE + 0.5) & 7
 
 
 def moon_phase_name(date_str):
     """Return the 8-point phase name."""
-    frac = moon_phase_fraction(date_str)
-    index = int((frac * 8 + 0.5) % 8)
-    return PHASE_NAMES[index]
+    return PHASE_NAMES[_phase_index_for_days(_days_since_epoch(date_str))]
 
 
 def moon_illumination_percent(date_str):
@@ -102,17 +261,36 @@ def moon_illumination_percent(date_str):
     return (1 - math.cos(2 * math.pi * frac)) / 2 * 100
 
 
-def fetch_sun_times(lat, lon, target_date):
-    """Fetch sunrise/sunset from Open-Meteo for a given date."""
-    params = urllib.parse.urlencode({
-        "latitude": lat,
-        "longitude": lon,
-        "daily": "sunrise,sunset",
-        "timezone": "auto",
-        "start_date": target_date,
-        "end_date": target_date,
-    })
-    return fetch_json(f"https://api.open-meteo.com/v1/forecast?{params}")
+def moon_phase_series(start_date, n):
+    """Return (fractions, illumination percents, phase name indexes) for n days from start_date.
+
+    Batch form for calendar-style callers: the date is resolved once and each
+    day is a plain float step, instead of re-parsing an ISO string per day.
+    """
+    base = _days_since_epoch(start_date)
+    fracs = [_fraction_for_days(base + i) for i in range(n)]
+    # Same formula as moon_illumination_percent with the constants folded.
+    cos, two_pi = math.cos, 2 * math.pi
+    illums = [(1.0 - cos(two_pi * f)) * 50.0 for f in fracs]
+    indexes = [_phase_index_for_days(base + i) for i in range(n)]
+    return fracs, illums, indexes
+
+
+def fetch_sun_times(lat, lon, target_date, refresh=False):
+    """Fetch sunrise/sunset from Open-Meteo for a given date.
+
+    Past dates never change, so their responses are cached on disk.
+    """
+    cacheable = target_date < date.today().isoformat()
+    cache_key = f"sun:{round(lat, 3)}:{round(lon, 3)}:{target_date}"
+    if cacheable and not refresh:
+        hit = _cache_get(cache_key)
+        if hit:
+            return hit
+    data = fetch_json(SUN_URL_FMT % (lat, lon, target_date, target_date))
+    if cacheable and data.get("daily"):
+        _cache_set(cache_key, data)
+    return data
 
 
 def main():
@@ -123,23 +301,26 @@ def main():
                         help="City, State (e.g. 'Cape Coral, FL')")
     parser.add_argument("--date", default=None,
                         help="'yesterday', 'today', or YYYY-MM-DD")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached geocode/sunrise results and refetch")
     args = parser.parse_args()
 
-    target = resolve_date(args.date) if args.date else date.today().isoformat()
+    target_day = resolve_date(args.date) if args.date else date.today()
+    target = target_day.isoformat()
 
-    phase = moon_phase_name(target)
-    illum = moon_illumination_percent(target)
+    phase = moon_phase_name(target_day)
+    illum = moon_illumination_percent(target_day)
     print(f"Moon ({target}): {phase}, {illum:.0f}% illuminated")
 
     location = args.location or os.environ.get("USER_LOCATION", "")
     if location:
-        geo = geocode(location)
+        geo = geocode(location, refresh=args.no_cache)
         if not geo:
             print(f"Could not geocode: {location}", file=sys.stderr)
             return 1
         lat, lon, name = geo
 
-        data = fetch_sun_times(lat, lon, target)
+        data = fetch_sun_times(lat, lon, target, refresh=args.no_cache)
         daily = data.get("daily", {})
         sunrise = daily.get("sunrise", [None])[0]
         sunset = daily.get("sunset", [None])[0]
@@ -4,36 +4,208 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import gzip
 import hashlib
+import http.client
 import json
 import os
+import shutil
 import tarfile
 import sys
+import threading
 import urllib.error
-import urllib.request
-from typing import Dict, List, Optional
+import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 
-from common_db import default_data_dir
 from common_progress import ProgressReporter
-import build_index
 
 TIMEOUT = 30
 DEFAULT_ARCHIVE_URL = "https://files.brianneradt.com/api/public/dl/xhCdAE8Z?inline=true"
 DEFAULT_ARCHIVE_NAME = "commentaries_ai_friendly.tar.gz"
+USER_AGENT = "openclaw-bible-commentary/0.1"
+MAX_REDIRECTS = 5
+CHUNK_SIZE = 1 << 20
+DOWNLOAD_WORKERS = 8
+
+ConnKey = Tuple[str, str, Optional[int]]
+
+# Keep-alive connections reused across downloads, keyed by (scheme, host, port).
+# http.client connections are not thread-safe, so each download thread owns its pool.
+_LOCAL = threading.local()
+_ALL_POOLS: List[Dict[ConnKey, http.client.HTTPConnection]] = []
+_POOLS_LOCK = threading.Lock()
+_EMIT_LOCK = threading.Lock()
+
+_AI_ROOT_CACHE: Dict[str, str] = {}
 
 
 def load_manifest() -> dict:
+    # build_index (and the sqlite/parsing stack behind it) is imported lazily so
+    # the module itself stays cheap to import, e.g. for --help.
+    import build_index
+
     return build_index.load_manifest()
 
 
-def _sha256_bytes(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+def _pool() -> Dict[ConnKey, http.client.HTTPConnection]:
+    pool = getattr(_LOCAL, "pool", None)
+    if pool is None:
+        pool = {}
+        _LOCAL.pool = pool
+        with _POOLS_LOCK:
+            _ALL_POOLS.append(pool)
+    return pool
+
+
+def _get_conn(scheme: str, host: str, port: Optional[int]) -> http.client.HTTPConnection:
+    pool = _pool()
+    key = (scheme, host, port)
+    conn = pool.get(key)
+    if conn is None:
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(host, port, timeout=TIMEOUT)
+        pool[key] = conn
+    return conn
+
+
+def _drop_conn(scheme: str, host: str, port: Optional[int]) -> None:
+    conn = _pool().pop((scheme, host, port), None)
+    if conn is not None:
+        conn.close()
+
+
+def _close_pool() -> None:
+    with _POOLS_LOCK:
+        for pool in _ALL_POOLS:
+            for conn in pool.values():
+                conn.close()
+            pool.clear()
+
+
+atexit.register(_close_pool)
+
+
+def _open(url: str, extra_headers: Optional[Dict[str, str]] = None) -> http.client.HTTPResponse:
+    """GET ``url`` over a pooled keep-alive connection, following redirects."""
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise urllib.error.URLError(f"unsupported URL: {url}")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = {"User-Agent": USER_AGENT, "Connection": "keep-alive", **(extra_headers or {})}
+        key = (parts.scheme, parts.hostname, parts.port)
+        for attempt in range(2):
+            conn = _get_conn(*key)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                break
+            except (
+                http.client.BadStatusLine,
+                http.client.ImproperConnectionState,
+                ConnectionResetError,
+                BrokenPipeError,
+            ) as exc:
+                # Pooled connection went stale (idle close or aborted read); reconnect once.
+                _drop_conn(*key)
+                if attempt:
+                    raise urllib.error.URLError(exc) from exc
+            except (OSError, http.client.HTTPException) as exc:
+                _drop_conn(*key)
+                raise urllib.error.URLError(exc) from exc
+        if resp.status in {301, 302, 303, 307, 308} and resp.getheader("Location"):
+            resp.read()
+            url = urllib.parse.urljoin(url, resp.getheader("Location"))
+            continue
+        if resp.status >= 400:
+            resp.read()
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return resp
+    raise urllib.error.URLError(f"too many redirects: {url}")
+
 
+def _meta_path(path: str) -> str:
+    return path + ".meta.json"
 
-def _download(url: str) -> bytes:
-    req = urllib.request.Request(url, headers={"User-Agent": "openclaw-bible-commentary/0.1"})
-    with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-        return resp.read()
+
+def _load_meta(path: str) -> dict:
+    """Return the validator sidecar for ``path`` if both it and the body exist."""
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(_meta_path(path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) and meta.get("sha256") else {}
+
+
+def _save_meta(path: str, url: str, resp: http.client.HTTPResponse, size: int, digest: str) -> None:
+    etag = resp.getheader("ETag")
+    last_modified = resp.getheader("Last-Modified")
+    if not etag and not last_modified:
+        try:
+            os.unlink(_meta_path(path))
+        except OSError:
+            pass
+        return
+    meta = {"url": url, "etag": etag, "last_modified": last_modified, "bytes": size, "sha256": digest}
+    with open(_meta_path(path), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _download_to(url: str, path: str, accept_gzip: bool = True) -> Tuple[int, str, bool]:
+    """Stream ``url`` into ``path``; return (bytes, sha256 hex digest, changed).
+
+    The body is written to a ``.part`` sibling and renamed into place on success so an
+    interrupted transfer never looks like a cached file. When ``path`` already exists
+    with a validator sidecar, the request is conditional and a 304 leaves the local
+    copy in place (``changed`` is False). With ``accept_gzip`` the server may compress
+    the transfer; the decompressed body is what gets hashed and stored.
+    """
+    meta = _load_meta(path)
+    if meta.get("url") != url:
+        meta = {}
+    headers: Dict[str, str] = {"Accept-Encoding": "gzip"} if accept_gzip else {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    resp = _open(url, headers)
+    if resp.status == 304:
+        resp.read()
+        return int(meta.get("bytes") or os.path.getsize(path)), meta["sha256"], False
+
+    tmp_path = path + ".part"
+    h = hashlib.sha256()
+    size = 0
+    gzipped = (resp.getheader("Content-Encoding") or "").strip().lower() == "gzip"
+    stream = gzip.GzipFile(fileobj=resp) if gzipped else resp
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                h.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        digest = h.hexdigest()
+        os.replace(tmp_path, path)
+        _save_meta(path, url, resp, size, digest)
+    except (OSError, EOFError, zlib.error, http.client.HTTPException) as exc:
+        resp.close()
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise urllib.error.URLError(exc) from exc
+    return size, digest, True
 
 
 def ensure_dirs(data_dir: str) -> None:
@@ -45,37 +217,46 @@ def ensure_dirs(data_dir: str) -> None:
 
 def _safe_extract_tar(archive_path: str, out_dir: str) -> None:
     out_abs = os.path.abspath(out_dir)
-    with tarfile.open(archive_path, "r:gz") as tf:
-        members = tf.getmembers()
-        for member in members:
+    # Stream mode: validate and extract each member as it is read, in one pass.
+    with tarfile.open(archive_path, "r|gz") as tf:
+        for member in tf:
             target = os.path.abspath(os.path.join(out_abs, member.name))
             if not target.startswith(out_abs + os.sep) and target != out_abs:
                 raise ValueError(f"Unsafe archive path: {member.name}")
-        try:
-            tf.extractall(path=out_abs, members=members, filter="data")
-        except TypeError:
-            tf.extractall(path=out_abs, members=members)
+            try:
+                tf.extract(member, path=out_abs, filter="data")
+            except TypeError:
+                tf.extract(member, path=out_abs)
+
+
+def _has_ai_friendly_layout(path: str) -> bool:
+    return os.path.isdir(os.path.join(path, "manifests")) and os.path.isdir(os.path.join(path, "schemas"))
 
 
 def _find_ai_friendly_root(data_dir: str) -> Optional[str]:
-    candidates = []
+    cached = _AI_ROOT_CACHE.get(data_dir)
+    if cached and _has_ai_friendly_layout(cached):
+        return cached
     base = os.path.join(data_dir, "ai_friendly")
-    candidates.extend(
-        [
-            base,
-            os.path.join(base, "ai_friendly"),
-            os.path.join(base, "commentaries_ai_friendly"),
-        ]
-    )
-    if os.path.isdir(base):
-        for name in os.listdir(base):
-            child = os.path.join(base, name)
-            if os.path.isdir(child):
-                candidates.append(child)
-    for c in candidates:
-        if os.path.isdir(os.path.join(c, "manifests")) and os.path.isdir(os.path.join(c, "schemas")):
-            return c
-    return None
+    found = None
+    for c in (base, os.path.join(base, "ai_friendly"), os.path.join(base, "commentaries_ai_friendly")):
+        if _has_ai_friendly_layout(c):
+            found = c
+            break
+    else:
+        try:
+            it = os.scandir(base)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        with it:
+            for entry in it:
+                if entry.is_dir() and _has_ai_friendly_layout(entry.path):
+                    found = entry.path
+                    break
+    if found:
+        # Only positive hits are remembered; a miss is re-checked after extraction.
+        _AI_ROOT_CACHE[data_dir] = found
+    return found
 
 
 def _bootstrap_ai_friendly_archive(data_dir: str, refresh: bool, progress: ProgressReporter) -> bool:
@@ -93,20 +274,18 @@ def _bootstrap_ai_friendly_archive(data_dir: str, refresh: bool, progress: Progr
     try:
         if refresh or not os.path.isfile(archive_path):
             progress.emit("DOWNLOAD", "fetching ai_friendly corpus archive", url=archive_url, filename=archive_name)
-            body = _download(archive_url)
-            with open(archive_path, "wb") as f:
-                f.write(body)
-            progress.emit("DOWNLOAD", "saved ai_friendly archive", bytes=len(body), sha256=_sha256_bytes(body)[:12])
+            # The archive is already gzip-compressed; ask for it as-is.
+            size, digest, changed = _download_to(archive_url, archive_path, accept_gzip=False)
+            if changed:
+                progress.emit("DOWNLOAD", "saved ai_friendly archive", bytes=size, sha256=digest[:12])
+            else:
+                progress.emit("DOWNLOAD", "ai_friendly archive unchanged on server", bytes=size, sha256=digest[:12])
         else:
             progress.emit("DOWNLOAD", "using cached ai_friendly archive", path=archive_path)
 
         # Clear extraction target on refresh.
         if refresh and os.path.isdir(ai_dir):
-            for root, dirs, files in os.walk(ai_dir, topdown=False):
-                for name in files:
-                    os.unlink(os.path.join(root, name))
-                for name in dirs:
-                    os.rmdir(os.path.join(root, name))
+            shutil.rmtree(ai_dir)
         os.makedirs(ai_dir, exist_ok=True)
         progress.emit("SETUP", "extracting ai_friendly archive", out_dir=ai_dir)
         _safe_extract_tar(archive_path, ai_dir)
@@ -121,7 +300,33 @@ def _bootstrap_ai_friendly_archive(data_dir: str, refresh: bool, progress: Progr
         return False
 
 
+def _emit(progress: ProgressReporter, phase: str, message: str, **extra) -> None:
+    with _EMIT_LOCK:
+        progress.emit(phase, message, **extra)
+
+
+def _fetch_one(idx: int, src: dict, raw_root: str, refresh: bool, progress: ProgressReporter, total: int) -> Optional[str]:
+    """Download one manifest source; return a warning message on failure."""
+    local_path = os.path.join(raw_root, src["local_path"])
+    if os.path.exists(local_path) and not refresh:
+        _emit(progress, "DOWNLOAD", "using cached source", current=idx, total=total, source=src["local_path"])
+        return None
+    try:
+        _emit(progress, "DOWNLOAD", "fetching source", current=idx, total=total, source=src["local_path"])
+        size, digest, changed = _download_to(src["source_url"], local_path)
+        if changed:
+            _emit(progress, "DOWNLOAD", "saved source", source=src["local_path"], bytes=size, sha256=digest[:12])
+        else:
+            _emit(progress, "DOWNLOAD", "source unchanged on server", source=src["local_path"], bytes=size, sha256=digest[:12])
+    except urllib.error.URLError as exc:
+        _emit(progress, "WARN", "download failed", source=src["local_path"], error=str(exc))
+        return f"{src['local_path']}: {exc}"
+    return None
+
+
 def bootstrap(manifest: dict, refresh: bool, progress: ProgressReporter, skip_build: bool = False) -> int:
+    from common_db import default_data_dir
+
     data_dir = os.path.expanduser(os.environ.get("BIBLE_COMMENTARY_DATA_DIR", default_data_dir()))
     ensure_dirs(data_dir)
     raw_root = os.path.join(data_dir, "raw")
@@ -133,27 +338,29 @@ def bootstrap(manifest: dict, refresh: bool, progress: ProgressReporter, skip_bu
         progress.emit("DONE", "ai_friendly setup complete (build skipped)")
         return 0
     if used_ai_archive:
+        import build_index
+
         progress.emit("PARSE", "starting index build from ai_friendly corpus")
         return build_index.build_index(manifest, refresh=refresh, progress=progress)
 
     sources = manifest.get("sources", [])
     warnings: List[str] = []
-    for idx, src in enumerate(sources, start=1):
-        local_path = os.path.join(raw_root, src["local_path"])
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        if os.path.exists(local_path) and not refresh:
-            progress.emit("DOWNLOAD", "using cached source", current=idx, total=len(sources), source=src["local_path"])
-            continue
-        try:
-            progress.emit("DOWNLOAD", "fetching source", current=idx, total=len(sources), source=src["local_path"])
-            body = _download(src["source_url"])
-            with open(local_path, "wb") as f:
-                f.write(body)
-            progress.emit("DOWNLOAD", "saved source", source=src["local_path"], bytes=len(body), sha256=_sha256_bytes(body)[:12])
-        except urllib.error.URLError as exc:
-            msg = f"{src['local_path']}: {exc}"
-            warnings.append(msg)
-            progress.emit("WARN", "download failed", source=src["local_path"], error=str(exc))
+    # Create each distinct parent directory once, before the download workers start.
+    for parent in {os.path.dirname(os.path.join(raw_root, src["local_path"])) for src in sources}:
+        os.makedirs(parent, exist_ok=True)
+    if sources:
+        # Sources are independent I/O; fetch them concurrently.
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(sources))) as ex:
+            futures = {
+                ex.submit(_fetch_one, idx, src, raw_root, refresh, progress, len(sources)): idx
+                for idx, src in enumerate(sources, start=1)
+            }
+            failed: Dict[int, str] = {}
+            for fut in as_completed(futures):
+                msg = fut.result()
+                if msg:
+                    failed[futures[fut]] = msg
+        warnings = [failed[idx] for idx in sorted(failed)]
 
     if warnings:
         progress.emit("WARN", "some downloads failed; continuing with available files", count=len(warnings))
@@ -162,6 +369,8 @@ def bootstrap(manifest: dict, refresh: bool, progress: ProgressReporter, skip_bu
         progress.emit("DONE", "download stage complete (build skipped)")
         return 0
 
+    import build_index
+
     progress.emit("PARSE", "starting index build")
     return build_index.build_index(manifest, refresh=refresh, progress=progress)
 
@@ -10,16 +10,53 @@ import os
 import re
 import sqlite3
 import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from html import unescape
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from common_db import PARSER_VERSION, book_lookup, connect, default_data_dir, init_schema, replace_entries_for_source, set_manifest, upsert_source
-from common_passages import Passage, match_book, parse_passage, scan_passages_in_text
+from common_db import PARSER_VERSION, EntryBatch, book_lookup, connect, default_data_dir, get_source_state, init_schema, replace_entries_for_source, set_manifest, set_source_stat, tune_for_bulk_load, upsert_source
+from common_passages import Passage, match_book, parse_passage, scan_lines
 from common_progress import ProgressReporter
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REF_MANIFEST = os.path.join(os.path.dirname(SCRIPT_DIR), "references", "sources-manifest.yaml")
+PARSE_WORKERS = os.cpu_count() or 1
+JSONL_READ_BUFFER = 1 << 20
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Line-breaking tags are rewritten first; scripts, styles and all remaining tags
+# then collapse to a space in a single pass.
+_LINE_BREAK_TAG_RE = re.compile(r"<br\s*/?>|</p>|</div>", re.I)
+_MARKUP_RE = re.compile(r"<script.*?>.*?</script>|<style.*?>.*?</style>|<[^>]+>", re.I | re.S)
+# Only runs of 2+ spaces need rewriting once tabs are spaces; a literal-prefixed
+# pattern lets the engine skip the single spaces between words.
+_MULTI_SPACE_RE = re.compile(r"  +")
+_BLANK_LINES_RE = re.compile(r"\n\n\n+")
+_COMMENTARY_ON_RE = re.compile(r"\b(Commentary on|Exposition of)\s+([1-3]?\s*[A-Za-z ]+)\b", re.I)
+_CHAPTER_FILE_RE = re.compile(r"(?:psalm|ps|chapter|ch)[-_ ]?(\d{1,3})", re.I)
+# Heading patterns run over the whole "\n"-joined document; [^\S\n] keeps a match
+# from spanning two lines, so results equal a per-line search(). The leading
+# lookahead gives the engine a first-character set to skip ahead with, which a
+# bare \b under re.I does not.
+_VERSE_HEAD_RE = re.compile(r"(?=[Vv])\b(?i:verse)[^\S\n]+(\d{1,3})\b")
+_CHAPTER_HEAD_RE = re.compile(r"(?=[PpCc])\b(?i:(psalm|chapter))[^\S\n]+(\d{1,3})\b")
+
+# Heading lines resolve the same few references over and over ("Psalm 23",
+# "Romans 8:3"); Passage is immutable, so parsed results can be shared.
+_parse_passage_cached = lru_cache(maxsize=8192)(parse_passage)
+
+# Manifest fields the parsers read besides the file and parser name; stored
+# entries are only current while these are unchanged too.
+_PARSE_KEY_FIELDS = ("default_book", "default_chapter")
+
+
+def _parse_pool(jobs: int) -> ProcessPoolExecutor:
+    """Worker processes for CPU-bound parsing; all database writes stay on the caller's thread."""
+    return ProcessPoolExecutor(max_workers=max(1, min(PARSE_WORKERS, jobs)))
 
 
 def load_manifest(path: str = REF_MANIFEST) -> dict:
@@ -28,44 +65,46 @@ def load_manifest(path: str = REF_MANIFEST) -> dict:
 
 
 def _strip_html(html: str) -> str:
-    text = re.sub(r"(?is)<script.*?>.*?</script>", " ", html)
-    text = re.sub(r"(?is)<style.*?>.*?</style>", " ", text)
-    text = re.sub(r"(?i)<br\s*/?>", "\n", text)
-    text = re.sub(r"(?i)</p>", "\n", text)
-    text = re.sub(r"(?i)</div>", "\n", text)
-    text = re.sub(r"(?is)<[^>]+>", " ", text)
+    text = _LINE_BREAK_TAG_RE.sub("\n", html)
+    text = _MARKUP_RE.sub(" ", text)
     text = unescape(text)
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    if "\t" in text:
+        text = text.replace("\t", " ")
+    text = _MULTI_SPACE_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
 
 def _file_hash(path: str) -> str:
-    h = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: hashes straight from the file descriptor into a reused buffer.
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
+
+
+def _has_ai_friendly_layout(path: str) -> bool:
+    return os.path.isdir(os.path.join(path, "manifests")) and os.path.isdir(os.path.join(path, "schemas"))
 
 
 def _find_ai_friendly_root(data_dir: str) -> Optional[str]:
-    candidates = []
     base = os.path.join(data_dir, "ai_friendly")
-    candidates.extend(
-        [
-            base,
-            os.path.join(base, "ai_friendly"),
-            os.path.join(base, "commentaries_ai_friendly"),
-        ]
-    )
-    if os.path.isdir(base):
-        for name in os.listdir(base):
-            child = os.path.join(base, name)
-            if os.path.isdir(child):
-                candidates.append(child)
-    for c in candidates:
-        if os.path.isdir(os.path.join(c, "manifests")) and os.path.isdir(os.path.join(c, "schemas")):
+    for c in (base, os.path.join(base, "ai_friendly"), os.path.join(base, "commentaries_ai_friendly")):
+        if _has_ai_friendly_layout(c):
             return c
+    # DirEntry.is_dir() comes from the directory listing itself, so plain files
+    # in base cost no stat; the scan stops at the first matching child.
+    try:
+        it = os.scandir(base)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    with it:
+        for entry in it:
+            if entry.is_dir() and _has_ai_friendly_layout(entry.path):
+                return entry.path
     return None
 
 
@@ -81,15 +120,31 @@ def _norm_commentator_key(value: str) -> str:
     return mapping.get(s, s)
 
 
-def _rows_from_ai_jsonl(path: str, source: dict, book_ids: Dict[str, int]) -> List[dict]:
-    rows: List[dict] = []
-    with open(path, "r", encoding="utf-8") as f:
+def _resolve_book(book_name: str, book_ids: Dict[str, int]) -> Optional[Tuple[int, str]]:
+    b = match_book(book_name)
+    if not b:
+        return None
+    _, _, canonical_book = b
+    book_id = book_ids.get(canonical_book.lower())
+    if not book_id:
+        return None
+    return int(book_id), canonical_book
+
+
+def _rows_from_ai_jsonl(path: str, source: dict, book_ids: Dict[str, int]) -> EntryBatch:
+    rows = EntryBatch(source["commentator_key"], source["work_title"])
+    # Records name the same few dozen books over and over; each distinct
+    # spelling is normalized and looked up once per file.
+    books: Dict[str, Optional[Tuple[int, str]]] = {}
+    # File iteration already reads in buffered chunks; the decoder skips
+    # surrounding whitespace itself, so lines are not strip()-copied first.
+    decode = _JSON_DECODER.decode
+    with open(path, "r", encoding="utf-8", buffering=JSONL_READ_BUFFER) as f:
         for line in f:
-            line = line.strip()
-            if not line:
+            if line.isspace():
                 continue
             try:
-                rec = json.loads(line)
+                rec = decode(line)
             except json.JSONDecodeError:
                 continue
             book_name = rec.get("book")
@@ -97,13 +152,14 @@ def _rows_from_ai_jsonl(path: str, source: dict, book_ids: Dict[str, int]) -> Li
             ch2 = rec.get("chapter_end")
             if not book_name or ch1 is None or ch2 is None:
                 continue
-            b = match_book(str(book_name))
-            if not b:
-                continue
-            _, _, canonical_book = b
-            book_id = book_ids.get(canonical_book.lower())
-            if not book_id:
+            book_name = str(book_name)
+            if book_name in books:
+                book = books[book_name]
+            else:
+                book = books[book_name] = _resolve_book(book_name, book_ids)
+            if not book:
                 continue
+            book_id, canonical_book = book
             gran = rec.get("granularity") or "range"
             if gran not in {"verse", "range", "chapter"}:
                 gran = "range"
@@ -112,26 +168,59 @@ def _rows_from_ai_jsonl(path: str, source: dict, book_ids: Dict[str, int]) -> Li
                 continue
             v1 = rec.get("verse_start")
             v2 = rec.get("verse_end")
-            rows.append(
-                {
-                    "commentator_key": source["commentator_key"],
-                    "work_title": source["work_title"],
-                    "book_id": int(book_id),
-                    "chapter_start": int(ch1),
-                    "verse_start": int(v1) if isinstance(v1, int) else None,
-                    "chapter_end": int(ch2),
-                    "verse_end": int(v2) if isinstance(v2, int) else None,
-                    "granularity": gran,
-                    "passage_label": rec.get("coverage_label") or f"{canonical_book} {ch1}",
-                    "excerpt": _normalize_excerpt(excerpt),
-                    "sort_chapter": int(ch1),
-                    "sort_verse": int(v1) if isinstance(v1, int) else 0,
-                }
-            )
+            v1 = int(v1) if isinstance(v1, int) else None
+            c1 = int(ch1)
+            rows.book_id.append(book_id)
+            rows.chapter_start.append(c1)
+            rows.verse_start.append(v1)
+            rows.chapter_end.append(int(ch2))
+            rows.verse_end.append(int(v2) if isinstance(v2, int) else None)
+            rows.granularity.append(gran)
+            rows.passage_label.append(rec.get("coverage_label") or f"{canonical_book} {ch1}")
+            rows.excerpt.append(_normalize_excerpt(excerpt))
+            rows.sort_chapter.append(c1)
+            rows.sort_verse.append(v1 or 0)
     return rows
 
 
-def _build_from_ai_friendly(conn: sqlite3.Connection, data_dir: str, progress: ProgressReporter) -> Optional[int]:
+def _parse_key(source: dict) -> str:
+    return json.dumps([source.get(k) for k in _PARSE_KEY_FIELDS])
+
+
+def _reuse_stored_entries(
+    conn: sqlite3.Connection,
+    commentator_key: str,
+    work_title: str,
+    local_path: str,
+    parser_name: str,
+    parse_key: Optional[str],
+    st: os.stat_result,
+) -> Tuple[bool, Optional[str]]:
+    """Decide whether the stored entries for a source are still current.
+
+    Returns (reuse, content_hash). Entries parsed by the current parser and
+    parse_key from a file with this mtime/size are reused without reading the
+    file. When only the mtime moved (re-downloaded or re-extracted with the
+    same bytes), the file is hashed and an unchanged hash keeps the entries
+    too, recording the new stat. A changed parse_key re-parses on either path.
+    The hash is returned whenever it was computed so callers need not read the
+    file twice.
+    """
+    row = get_source_state(conn, commentator_key, work_title, local_path)
+    if not row or row["parser_name"] != parser_name or row["parser_version"] != PARSER_VERSION:
+        return False, None
+    if row["parse_key"] != parse_key or row["size"] != st.st_size:
+        return False, None
+    if row["mtime"] == st.st_mtime:
+        return True, None
+    content_hash = _file_hash(local_path)
+    if content_hash == row["content_hash"]:
+        set_source_stat(conn, row["id"], st.st_mtime, st.st_size, parse_key)
+        return True, content_hash
+    return False, content_hash
+
+
+def _build_from_ai_friendly(conn: sqlite3.Connection, data_dir: str, progress: ProgressReporter, refresh: bool = False) -> Optional[int]:
     ai_root = _find_ai_friendly_root(data_dir)
     if not ai_root:
         return None
@@ -141,6 +230,7 @@ def _build_from_ai_friendly(conn: sqlite3.Connection, data_dir: str, progress: P
     total_inserted = 0
     progress.emit("INDEX", "detected ai_friendly corpus", root=ai_root)
 
+    jobs = []
     for idx, cdir in enumerate(commentator_dirs, start=1):
         jsonl = os.path.join(ai_root, cdir, "records.jsonl")
         if not os.path.isfile(jsonl):
@@ -162,7 +252,12 @@ def _build_from_ai_friendly(conn: sqlite3.Connection, data_dir: str, progress: P
         work_title = first.get("work") or f"AI Friendly {cdir}"
         source_url = first.get("source_retrieval_url") or first.get("source_canonical_url") or ""
         parser_name = "ai_friendly_jsonl"
-        content_hash = _file_hash(jsonl)
+        st = os.stat(jsonl)
+        reuse, content_hash = (False, None) if refresh else _reuse_stored_entries(conn, commentator_key, work_title, jsonl, parser_name, None, st)
+        if reuse:
+            progress.emit("INDEX", "ai_friendly dataset unchanged; skipping", current=idx, total=len(commentator_dirs), dataset=cdir)
+            continue
+        content_hash = content_hash or _file_hash(jsonl)
         source = {
             "commentator_key": commentator_key,
             "work_title": work_title,
@@ -177,19 +272,25 @@ def _build_from_ai_friendly(conn: sqlite3.Connection, data_dir: str, progress: P
             PARSER_VERSION,
             content_hash,
         )
-
-        rows = _rows_from_ai_jsonl(jsonl, source, book_ids)
-        replace_entries_for_source(conn, source_id, rows)
-        conn.commit()
-        total_inserted += len(rows)
-        progress.emit(
-            "INDEX",
-            "processed ai_friendly dataset",
-            current=idx,
-            total=len(commentator_dirs),
-            dataset=cdir,
-            entries=len(rows),
-        )
+        jobs.append((idx, cdir, jsonl, source, source_id, st))
+
+    # Parse datasets in parallel; results are consumed in submission order so the
+    # resulting entry ids do not depend on worker scheduling.
+    with _parse_pool(len(jobs)) as pool:
+        futures = [pool.submit(_rows_from_ai_jsonl, jsonl, source, book_ids) for _, _, jsonl, source, _, _ in jobs]
+        for (idx, cdir, _, _, source_id, st), fut in zip(jobs, futures):
+            rows = fut.result()
+            replace_entries_for_source(conn, source_id, rows)
+            set_source_stat(conn, source_id, st.st_mtime, st.st_size, None)
+            total_inserted += len(rows)
+            progress.emit(
+                "INDEX",
+                "processed ai_friendly dataset",
+                current=idx,
+                total=len(commentator_dirs),
+                dataset=cdir,
+                entries=len(rows),
+            )
     set_manifest(conn, "parser_version", PARSER_VERSION)
     set_manifest(conn, "source_manifest_version", "ai_friendly_v1")
     conn.commit()
@@ -203,7 +304,7 @@ def _infer_default_book(source: dict, text: str) -> Optional[str]:
     for token in (source.get("work_title", ""), source.get("commentator_key", "")):
         if "psalm" in token.lower():
             return "Psalms"
-    m = re.search(r"\b(Commentary on|Exposition of)\s+([1-3]?\s*[A-Za-z ]+)\b", text[:1000], re.I)
+    m = _COMMENTARY_ON_RE.search(text[:1000])
     if m:
         return m.group(2).strip()
     return None
@@ -211,7 +312,7 @@ def _infer_default_book(source: dict, text: str) -> Optional[str]:
 
 def _chapter_from_filename(path: str) -> Optional[int]:
     base = os.path.basename(path)
-    m = re.search(r"(?:psalm|ps|chapter|ch)[-_ ]?(\d{1,3})", base, re.I)
+    m = _CHAPTER_FILE_RE.search(base)
     if m:
         return int(m.group(1))
     return None
@@ -219,90 +320,145 @@ def _chapter_from_filename(path: str) -> Optional[int]:
 
 def _normalize_excerpt(text: str, max_len: int = 900) -> str:
     text = text.strip()
-    text = re.sub(r"\s+", " ", text)
+    # Every whitespace character other than " " is non-printable, so a printable
+    # text without double spaces is already collapsed. Otherwise split()/join()
+    # is the same collapse as re.sub(r"\s+", " ") without the regex engine.
+    if "  " in text or not text.isprintable():
+        text = " ".join(text.split())
     if len(text) <= max_len:
         return text
     cut = text[: max_len - 1]
-    if " " in cut:
-        cut = cut.rsplit(" ", 1)[0]
+    i = cut.rfind(" ")
+    if i >= 0:
+        cut = cut[:i]
     return cut + "…"
 
 
-def _make_entry(source: dict, p: Passage, excerpt: str, source_id: int) -> dict:
-    gran = "chapter" if p.is_chapter_only else ("verse" if p.chapter_start == p.chapter_end and p.verse_start == p.verse_end else "range")
-    return {
-        "source_id": source_id,
-        "commentator_key": source["commentator_key"],
-        "work_title": source["work_title"],
-        "book_id": p.book_id,
-        "chapter_start": p.chapter_start,
-        "verse_start": p.verse_start,
-        "chapter_end": p.chapter_end,
-        "verse_end": p.verse_end,
-        "granularity": gran,
-        "passage_label": p.normalized_label(),
-        "excerpt": _normalize_excerpt(excerpt),
-        "sort_chapter": p.chapter_start,
-        "sort_verse": p.verse_start or 0,
-    }
-
-
-def parse_source_file(source: dict, local_path: str, source_id: int) -> List[dict]:
-    with open(local_path, "r", encoding="utf-8", errors="replace") as f:
-        raw = f.read()
-    text = _strip_html(raw) if local_path.lower().endswith((".html", ".htm")) else raw
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    default_book = _infer_default_book(source, text)
-    parser = source.get("parser", "generic_refscan")
-    entries: List[dict] = []
-
-    if parser == "psalm_chapter_fallback":
-        ch = source.get("default_chapter") or _chapter_from_filename(local_path)
-        if default_book and ch:
-            p = parse_passage(f"{default_book} {ch}")
-            excerpt = "\n".join(lines[:8]) or text[:700]
-            entries.append(_make_entry(source, p, excerpt, source_id))
-            return entries
-
+def _add_entry(entries: EntryBatch, p: Passage, excerpt: str, labels: Optional[Dict[Tuple[int, ...], Tuple[str, str]]] = None) -> None:
+    # labels memoizes (label, granularity) per passage span for callers that
+    # add many entries, since the same passages recur throughout a document.
+    key = (p.book_id, p.chapter_start, p.verse_start, p.chapter_end, p.verse_end)
+    cached = labels.get(key) if labels is not None else None
+    if cached is None:
+        gran = "chapter" if p.is_chapter_only else ("verse" if p.chapter_start == p.chapter_end and p.verse_start == p.verse_end else "range")
+        cached = (p.normalized_label(), gran)
+        if labels is not None:
+            labels[key] = cached
+    label, gran = cached
+    entries.book_id.append(p.book_id)
+    entries.chapter_start.append(p.chapter_start)
+    entries.verse_start.append(p.verse_start)
+    entries.chapter_end.append(p.chapter_end)
+    entries.verse_end.append(p.verse_end)
+    entries.granularity.append(gran)
+    entries.passage_label.append(label)
+    entries.excerpt.append(_normalize_excerpt(excerpt))
+    entries.sort_chapter.append(p.chapter_start)
+    entries.sort_verse.append(p.verse_start or 0)
+
+
+def _first_match_by_line(pattern: re.Pattern, doc: str, line_starts: List[int]) -> Dict[int, re.Match]:
+    """Map line index -> leftmost match on that line, from one pass over the joined document."""
+    hits: Dict[int, re.Match] = {}
+    for m in pattern.finditer(doc):
+        hits.setdefault(bisect_right(line_starts, m.start()) - 1, m)
+    return hits
+
+
+def _parse_psalm_fallback(source: dict, local_path: str, text: str, lines: List[str], default_book: Optional[str], entries: EntryBatch) -> None:
+    # One chapter-level entry per file when the chapter is known; otherwise
+    # treat the file like any other commentary.
+    ch = source.get("default_chapter") or _chapter_from_filename(local_path)
+    if default_book and ch:
+        p = parse_passage(f"{default_book} {ch}")
+        excerpt = "\n".join(lines[:8]) or text[:700]
+        _add_entry(entries, p, excerpt)
+        return
+    _parse_refscan(source, local_path, text, lines, default_book, entries)
+
+
+def _parse_refscan(source: dict, local_path: str, text: str, lines: List[str], default_book: Optional[str], entries: EntryBatch) -> None:
     # Generic line-based reference scan: capture nearby content following detected reference.
+    # Each line is scanned once up front and the results are reused by the snippet
+    # lookahead below.
+    scans = scan_lines(lines, default_book=default_book)
+    default_chapter = source.get("default_chapter")
+    labels: Dict[Tuple[int, ...], Tuple[str, str]] = {}
+    verse_heads: Dict[int, re.Match] = {}
+    chapter_heads: Dict[int, re.Match] = {}
+    if default_book:
+        # Headings have literal prefixes, so one document-level pass per pattern
+        # beats two search() calls on every line.
+        line_starts: List[int] = []
+        pos = 0
+        for ln in lines:
+            line_starts.append(pos)
+            pos += len(ln) + 1
+        doc = "\n".join(lines)
+        verse_heads = _first_match_by_line(_VERSE_HEAD_RE, doc, line_starts)
+        chapter_heads = _first_match_by_line(_CHAPTER_HEAD_RE, doc, line_starts)
+    n_lines = len(lines)
     for i, line in enumerate(lines):
-        found = scan_passages_in_text(line, default_book=default_book)
+        found = scans[i]
         if not found and default_book:
             # Handle headings like "Verse 3" when current source has a known default book/chapter.
-            m_verse = re.search(r"\bVerse\s+(\d{1,3})\b", line, re.I)
-            m_ch = re.search(r"\b(Psalm|Chapter)\s+(\d{1,3})\b", line, re.I)
+            m_verse = verse_heads.get(i)
+            m_ch = chapter_heads.get(i)
             if m_ch:
                 try:
-                    found = [parse_passage(f"{default_book} {int(m_ch.group(2))}")]
+                    found = [_parse_passage_cached(f"{default_book} {int(m_ch.group(2))}")]
                 except Exception:
                     found = []
-            elif m_verse and source.get("default_chapter"):
+            elif m_verse and default_chapter:
                 try:
-                    found = [parse_passage(f"{default_book} {int(source['default_chapter'])}:{int(m_verse.group(1))}")]
+                    found = [_parse_passage_cached(f"{default_book} {int(default_chapter)}:{int(m_verse.group(1))}")]
                 except Exception:
                     found = []
         if not found:
             continue
         snippet_lines = [line]
-        for j in range(i + 1, min(i + 8, len(lines))):
+        for j in range(i + 1, min(i + 8, n_lines)):
             # stop if next heading with another ref appears
-            if scan_passages_in_text(lines[j], default_book=default_book):
+            if scans[j]:
                 break
             snippet_lines.append(lines[j])
         excerpt = " ".join(snippet_lines)
         for p in found[:3]:
-            entries.append(_make_entry(source, p, excerpt, source_id))
+            _add_entry(entries, p, excerpt, labels)
 
-    if entries:
-        return entries
 
+def _parse_default_fallback(source: dict, text: str, lines: List[str], entries: EntryBatch) -> None:
     # Fallback: create chapter-level entry if manifest supplies default scope.
     if source.get("default_book") and source.get("default_chapter"):
         p = parse_passage(f"{source['default_book']} {int(source['default_chapter'])}")
-        entries.append(_make_entry(source, p, "\n".join(lines[:12]) or text[:800], source_id))
+        _add_entry(entries, p, "\n".join(lines[:12]) or text[:800])
     elif source.get("default_book"):
         p = parse_passage(f"{source['default_book']} 1")
-        entries.append(_make_entry(source, p, "\n".join(lines[:12]) or text[:800], source_id))
+        _add_entry(entries, p, "\n".join(lines[:12]) or text[:800])
+
+
+# Parser name (manifest "parser") -> handler; unknown names use the generic scan.
+_PARSERS = {
+    "psalm_chapter_fallback": _parse_psalm_fallback,
+    "generic_refscan": _parse_refscan,
+}
+
+
+def parse_source_file(source: dict, local_path: str) -> EntryBatch:
+    # One bytes read decoded in a single call; text mode would also run an
+    # incremental decoder and a newline-translation pass, which splitlines()
+    # below makes redundant.
+    with open(local_path, "rb") as f:
+        raw = f.read().decode("utf-8", "replace")
+    text = _strip_html(raw) if local_path.lower().endswith((".html", ".htm")) else raw
+    lines = [ln for ln in map(str.strip, text.splitlines()) if ln]
+    default_book = _infer_default_book(source, text)
+    entries = EntryBatch(source["commentator_key"], source["work_title"])
+
+    handler = _PARSERS.get(source.get("parser", "generic_refscan"), _parse_refscan)
+    handler(source, local_path, text, lines, default_book, entries)
+    if not entries:
+        _parse_default_fallback(source, text, lines, entries)
     return entries
 
 
@@ -312,10 +468,17 @@ def build_index(manifest: dict, refresh: bool = False, progress: Optional[Progre
     raw_root = os.path.join(data_dir, "raw")
     index_path = os.path.expanduser(os.environ.get("BIBLE_COMMENTARY_INDEX_PATH", os.path.join(data_dir, "index", "commentary.sqlite")))
     conn = connect(index_path)
+    tune_for_bulk_load(conn)
     init_schema(conn)
 
+    # All sources are ingested in one transaction, committed once at the end.
+    # Taking the write lock up front means a concurrent writer makes this wait
+    # in the busy handler here rather than fail with SQLITE_BUSY mid-build when
+    # a deferred transaction tries to upgrade.
+    conn.execute("BEGIN IMMEDIATE")
+
     # Preferred index path: pre-normalized ai_friendly JSONL corpus.
-    ai_result = _build_from_ai_friendly(conn, data_dir, progress)
+    ai_result = _build_from_ai_friendly(conn, data_dir, progress, refresh=refresh)
     if ai_result is not None:
         conn.close()
         return ai_result
@@ -323,33 +486,57 @@ def build_index(manifest: dict, refresh: bool = False, progress: Optional[Progre
     sources = manifest.get("sources", [])
     total_inserted = 0
     progress.emit("INDEX", "starting index build", sources=len(sources), db=index_path)
+    jobs = []
     for idx, source in enumerate(sources, start=1):
         local_rel = source["local_path"]
         local_path = os.path.join(raw_root, local_rel)
         if not os.path.isfile(local_path):
             progress.emit("WARN", "raw source file missing; skipping", source=local_rel)
             continue
-        content_hash = _file_hash(local_path)
+        # Sources whose file, parser and parse settings match the last
+        # successful parse keep their entries as-is; only changed sources are
+        # re-parsed.
+        parser_name = source.get("parser", "generic_refscan")
+        parse_key = _parse_key(source)
+        st = os.stat(local_path)
+        reuse, content_hash = (
+            (False, None)
+            if refresh
+            else _reuse_stored_entries(conn, source["commentator_key"], source["work_title"], local_path, parser_name, parse_key, st)
+        )
+        if reuse:
+            progress.emit("INDEX", "source unchanged; skipping", current=idx, total=len(sources), source=local_rel)
+            continue
+        content_hash = content_hash or _file_hash(local_path)
         source_id = upsert_source(
             conn,
             source["commentator_key"],
             source["work_title"],
             source["source_url"],
             local_path,
-            source.get("parser", "generic_refscan"),
+            parser_name,
             PARSER_VERSION,
             content_hash,
         )
-        try:
-            parsed_entries = parse_source_file(source, local_path, source_id)
-        except Exception as exc:
-            progress.emit("WARN", "parse failed; retaining prior entries if present", source=local_rel, error=str(exc))
-            continue
+        jobs.append((idx, source, local_rel, local_path, source_id, st, parse_key))
+
+    with _parse_pool(len(jobs)) as pool:
+        futures = [pool.submit(parse_source_file, source, local_path) for _, source, _, local_path, _, _, _ in jobs]
+        for (idx, _, local_rel, _, source_id, st, parse_key), fut in zip(jobs, futures):
+            try:
+                parsed_entries = fut.result()
+            except Exception as exc:
+                progress.emit("WARN", "parse failed; retaining prior entries if present", source=local_rel, error=str(exc))
+                # upsert_source already stored this file's hash; forget the stat
+                # so the next build re-parses it rather than matching that hash
+                # and keeping the prior entries for good.
+                set_source_stat(conn, source_id, None, None, None)
+                continue
 
-        replace_entries_for_source(conn, source_id, parsed_entries)
-        conn.commit()
-        total_inserted += len(parsed_entries)
-        progress.emit("INDEX", "processed source", current=idx, total=len(sources), entries=len(parsed_entries), source=local_rel)
+            replace_entries_for_source(conn, source_id, parsed_entries)
+            set_source_stat(conn, source_id, st.st_mtime, st.st_size, parse_key)
+            total_inserted += len(parsed_entries)
+            progress.emit("INDEX", "processed source", current=idx, total=len(sources), entries=len(parsed_entries), source=local_rel)
 
     set_manifest(conn, "parser_version", PARSER_VERSION)
     set_manifest(conn, "source_manifest_version", str(manifest.get("manifest_version", "1")))
@@ -361,7 +548,7 @@ def build_index(manifest: dict, refresh: bool = False, progress: Optional[Progre
 
 def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser(description="Build SQLite commentary index")
-    ap.add_argument("--refresh", action="store_true", help="Rebuild index from downloaded raw files")
+    ap.add_argument("--refresh", action="store_true", help="Re-parse every source, even files unchanged since the last build")
     ap.add_argument("--progress", action="store_true", help="Emit progress messages")
     ap.add_argument("--json-progress", action="store_true", help="Emit progress as JSON lines")
     args = ap.parse_args(argv)
@@ -4,15 +4,25 @@
 from __future__ import annotations
 
 import os
+import re
 import sqlite3
 import time
-from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 from common_passages import BOOKS, Passage
 
-SCHEMA_VERSION = "1"
+# Bump whenever init_schema() gains tables, columns or indexes; queries only
+# migrate an index whose stored schema_version differs.
+SCHEMA_VERSION = "3"
 PARSER_VERSION = "0.1"
 
+# INSERT ... RETURNING needs SQLite 3.35+; older libraries re-select the id.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 
 def utc_now() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
@@ -42,9 +52,38 @@ def connect(path: Optional[str] = None) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL lets queries read while an index build writes. Under WAL, NORMAL sync
+    # can only lose the latest commits on power loss, never corrupt the file,
+    # and the index can always be rebuilt from the corpus.
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
     return conn
 
 
+def connect_readonly(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open an existing index for queries only.
+
+    Skips the schema/migration writes connect() callers follow up with and
+    never takes the write lock. On a WAL index (see connect()) it therefore
+    reads the last committed state while an index build writes.
+    """
+    db_path = expand_user(path or default_index_path())
+    conn = sqlite3.connect(f"{Path(db_path).as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    return conn
+
+
+def tune_for_bulk_load(conn: sqlite3.Connection) -> None:
+    """Give index builds a larger page cache than connect()'s default."""
+    conn.execute("PRAGMA cache_size = -262144")
+
+
 def init_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
@@ -68,6 +107,9 @@ def init_schema(conn: sqlite3.Connection) -> None:
           parser_version TEXT NOT NULL,
           content_hash TEXT,
           downloaded_at TEXT NOT NULL,
+          mtime REAL,
+          size INTEGER,
+          parse_key TEXT,
           UNIQUE(commentator_key, work_title, local_raw_path)
         );
         CREATE TABLE IF NOT EXISTS entries (
@@ -107,26 +149,72 @@ def init_schema(conn: sqlite3.Connection) -> None:
         CREATE INDEX IF NOT EXISTS idx_sources_commentator ON sources(commentator_key);
         """
     )
+    _add_missing_columns(conn, "sources", (("mtime", "REAL"), ("size", "INTEGER"), ("parse_key", "TEXT")))
+    _init_fts(conn)
     seed_books(conn)
     set_manifest(conn, "schema_version", SCHEMA_VERSION)
     conn.commit()
 
 
+# External-content FTS5 index over entries: the text lives only in entries and
+# the triggers keep the token index in step with every insert/delete/update.
+_FTS_SCHEMA_SQL = """
+    CREATE VIRTUAL TABLE entries_fts USING fts5(
+      excerpt, passage_label, content='entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS entries_fts_ai AFTER INSERT ON entries BEGIN
+      INSERT INTO entries_fts(rowid, excerpt, passage_label) VALUES (new.id, new.excerpt, new.passage_label);
+    END;
+    CREATE TRIGGER IF NOT EXISTS entries_fts_ad AFTER DELETE ON entries BEGIN
+      INSERT INTO entries_fts(entries_fts, rowid, excerpt, passage_label)
+        VALUES ('delete', old.id, old.excerpt, old.passage_label);
+    END;
+    CREATE TRIGGER IF NOT EXISTS entries_fts_au AFTER UPDATE OF excerpt, passage_label ON entries BEGIN
+      INSERT INTO entries_fts(entries_fts, rowid, excerpt, passage_label)
+        VALUES ('delete', old.id, old.excerpt, old.passage_label);
+      INSERT INTO entries_fts(rowid, excerpt, passage_label) VALUES (new.id, new.excerpt, new.passage_label);
+    END;
+"""
+
+
+def _init_fts(conn: sqlite3.Connection) -> bool:
+    """Create the excerpt text index if missing; False when SQLite lacks FTS5."""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'entries_fts'").fetchone():
+        return True
+    try:
+        conn.executescript(_FTS_SCHEMA_SQL)
+    except sqlite3.OperationalError:
+        return False
+    # Index built before the text index existed: tokenize what is already there.
+    conn.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+    return True
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Sequence[Tuple[str, str]]) -> None:
+    """Bring indexes created by older versions up to the current table layout."""
+    existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+_INSERT_BOOK_SQL = "INSERT INTO books(id, canon_order, osis, name) VALUES (?, ?, ?, ?)"
+_INSERT_BOOK_ALIAS_SQL = "INSERT OR IGNORE INTO book_aliases(alias, book_id) VALUES (?, ?)"
+
+
 def seed_books(conn: sqlite3.Connection) -> None:
     count = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
     if count:
         return
-    for idx, (osis, name, aliases) in enumerate(BOOKS, start=1):
-        conn.execute(
-            "INSERT INTO books(id, canon_order, osis, name) VALUES (?, ?, ?, ?)",
-            (idx, idx, osis, name),
-        )
-        alias_values = {osis.lower(), name.lower(), *(a.lower() for a in aliases)}
-        for alias in alias_values:
-            conn.execute(
-                "INSERT OR IGNORE INTO book_aliases(alias, book_id) VALUES (?, ?)",
-                (alias, idx),
-            )
+    conn.executemany(_INSERT_BOOK_SQL, [(idx, idx, osis, name) for idx, (osis, name, _) in enumerate(BOOKS, start=1)])
+    conn.executemany(
+        _INSERT_BOOK_ALIAS_SQL,
+        [
+            (alias, idx)
+            for idx, (osis, name, aliases) in enumerate(BOOKS, start=1)
+            for alias in {osis.lower(), name.lower(), *(a.lower() for a in aliases)}
+        ],
+    )
 
 
 def get_manifest(conn: sqlite3.Connection, key: str) -> Optional[str]:
@@ -142,19 +230,33 @@ def set_manifest(conn: sqlite3.Connection, key: str, value: str) -> None:
     )
 
 
+# Aliases are stored lower-cased by seed_books; osis/name are folded here.
+_BOOK_LOOKUP_SQL = """
+    SELECT lower(osis), id FROM books
+    UNION ALL SELECT lower(name), id FROM books
+    UNION ALL SELECT alias, book_id FROM book_aliases
+"""
+
+
+@lru_cache(maxsize=8)
 def book_lookup(conn: sqlite3.Connection) -> Dict[str, int]:
-    rows = conn.execute(
-        "SELECT b.id, b.osis, b.name, a.alias FROM books b LEFT JOIN book_aliases a ON a.book_id = b.id"
-    ).fetchall()
-    mapping: Dict[str, int] = {}
-    for row in rows:
-        if row["osis"]:
-            mapping[row["osis"].lower()] = row["id"]
-        if row["name"]:
-            mapping[row["name"].lower()] = row["id"]
-        if row["alias"]:
-            mapping[row["alias"].lower()] = row["id"]
-    return mapping
+    """Alias -> book id for this index; shared per connection, so treat it as read-only.
+
+    Call after init_schema: seed_books only ever fills an empty table, so once
+    seeded the mapping cannot change under an open connection.
+    """
+    return {alias: book_id for alias, book_id in conn.execute(_BOOK_LOOKUP_SQL) if alias}
+
+
+_UPSERT_SOURCE_SQL = """
+    INSERT INTO sources(commentator_key, work_title, source_url, local_raw_path, parser_name, parser_version, content_hash, downloaded_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(commentator_key, work_title, local_raw_path)
+    DO UPDATE SET source_url=excluded.source_url, parser_name=excluded.parser_name,
+                  parser_version=excluded.parser_version, content_hash=excluded.content_hash,
+                  downloaded_at=excluded.downloaded_at
+"""
+_UPSERT_SOURCE_RETURNING_SQL = _UPSERT_SOURCE_SQL + " RETURNING id"
 
 
 def upsert_source(
@@ -169,17 +271,11 @@ def upsert_source(
     downloaded_at: Optional[str] = None,
 ) -> int:
     downloaded_at = downloaded_at or utc_now()
-    conn.execute(
-        """
-        INSERT INTO sources(commentator_key, work_title, source_url, local_raw_path, parser_name, parser_version, content_hash, downloaded_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(commentator_key, work_title, local_raw_path)
-        DO UPDATE SET source_url=excluded.source_url, parser_name=excluded.parser_name,
-                      parser_version=excluded.parser_version, content_hash=excluded.content_hash,
-                      downloaded_at=excluded.downloaded_at
-        """,
-        (commentator_key, work_title, source_url, local_raw_path, parser_name, parser_version, content_hash, downloaded_at),
-    )
+    params = (commentator_key, work_title, source_url, local_raw_path, parser_name, parser_version, content_hash, downloaded_at)
+    if _HAS_RETURNING:
+        # fetchall() steps the statement to completion so it is not left active.
+        return int(conn.execute(_UPSERT_SOURCE_RETURNING_SQL, params).fetchall()[0][0])
+    conn.execute(_UPSERT_SOURCE_SQL, params)
     row = conn.execute(
         "SELECT id FROM sources WHERE commentator_key=? AND work_title=? AND local_raw_path=?",
         (commentator_key, work_title, local_raw_path),
@@ -187,68 +283,189 @@ def upsert_source(
     return int(row["id"])
 
 
-def replace_entries_for_source(conn: sqlite3.Connection, source_id: int, rows: Sequence[Mapping[str, object]]) -> None:
-    existing = conn.execute("SELECT commentator_key, book_id, chapter_start, chapter_end FROM entries WHERE source_id = ?", (source_id,))
-    cov_keys = {(r["commentator_key"], r["book_id"], r["chapter_start"], r["chapter_end"]) for r in existing.fetchall()}
-    conn.execute("DELETE FROM entries WHERE source_id = ?", (source_id,))
-    for key in cov_keys:
-        conn.execute(
-            "DELETE FROM coverage WHERE commentator_key=? AND book_id=? AND chapter_start=? AND chapter_end=?",
-            key,
-        )
-
-    now = utc_now()
-    inserted_cov = set()
-    for row in rows:
-        conn.execute(
-            """
-            INSERT INTO entries(
-              source_id, commentator_key, work_title, book_id, chapter_start, verse_start,
-              chapter_end, verse_end, granularity, passage_label, excerpt, sort_chapter, sort_verse, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                source_id,
-                row["commentator_key"],
-                row["work_title"],
-                row["book_id"],
-                row["chapter_start"],
-                row.get("verse_start"),
-                row["chapter_end"],
-                row.get("verse_end"),
-                row["granularity"],
-                row["passage_label"],
-                row["excerpt"],
-                row["sort_chapter"],
-                row["sort_verse"],
-                now,
-            ),
-        )
-        cov = (
-            row["commentator_key"],
-            row["book_id"],
-            row["chapter_start"],
-            row["chapter_end"],
-        )
-        if cov not in inserted_cov:
-            inserted_cov.add(cov)
-            conn.execute(
-                "INSERT OR IGNORE INTO coverage(commentator_key, book_id, chapter_start, chapter_end, notes) VALUES (?, ?, ?, ?, ?)",
-                (*cov, None),
-            )
-
-
-def _sql_candidates(conn: sqlite3.Connection, p: Passage) -> List[sqlite3.Row]:
-    params = [p.book_id, p.chapter_end, p.chapter_start]
-    sql = """
-      SELECT e.*, s.source_url, s.local_raw_path
-      FROM entries e
-      JOIN sources s ON s.id = e.source_id
-      WHERE e.book_id = ?
-        AND e.chapter_start <= ?
-        AND e.chapter_end >= ?
+def get_source_state(
+    conn: sqlite3.Connection, commentator_key: str, work_title: str, local_raw_path: str
+) -> Optional[sqlite3.Row]:
+    return conn.execute(
+        "SELECT id, parser_name, parser_version, content_hash, mtime, size, parse_key FROM sources "
+        "WHERE commentator_key=? AND work_title=? AND local_raw_path=?",
+        (commentator_key, work_title, local_raw_path),
+    ).fetchone()
+
+
+def set_source_stat(
+    conn: sqlite3.Connection, source_id: int, mtime: Optional[float], size: Optional[int], parse_key: Optional[str]
+) -> None:
+    """Record the file stat and parse settings a source's entries were parsed from."""
+    conn.execute("UPDATE sources SET mtime=?, size=?, parse_key=? WHERE id=?", (mtime, size, parse_key, source_id))
+
+
+@dataclass
+class EntryBatch:
+    """Entry rows for one source, stored column-wise.
+
+    Parsers append straight into the column lists; replace_entries_for_source
+    zips them into insert parameters without building a dict per row.
     """
-    return conn.execute(sql, params).fetchall()
+
+    commentator_key: str
+    work_title: str
+    book_id: List[int] = field(default_factory=list)
+    chapter_start: List[int] = field(default_factory=list)
+    verse_start: List[Optional[int]] = field(default_factory=list)
+    chapter_end: List[int] = field(default_factory=list)
+    verse_end: List[Optional[int]] = field(default_factory=list)
+    granularity: List[str] = field(default_factory=list)
+    passage_label: List[str] = field(default_factory=list)
+    excerpt: List[str] = field(default_factory=list)
+    sort_chapter: List[int] = field(default_factory=list)
+    sort_verse: List[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.book_id)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, object]]) -> "EntryBatch":
+        first = rows[0] if rows else {}
+        key, title = first.get("commentator_key", ""), first.get("work_title", "")
+        batch = cls(str(key), str(title))
+        for row in rows:
+            # The batch stores commentator and work once, so they must not vary.
+            if row.get("commentator_key", "") != key or row.get("work_title", "") != title:
+                raise ValueError("entry rows for one source must share commentator_key and work_title")
+            batch.book_id.append(row["book_id"])
+            batch.chapter_start.append(row["chapter_start"])
+            batch.verse_start.append(row.get("verse_start"))
+            batch.chapter_end.append(row["chapter_end"])
+            batch.verse_end.append(row.get("verse_end"))
+            batch.granularity.append(row["granularity"])
+            batch.passage_label.append(row["passage_label"])
+            batch.excerpt.append(row["excerpt"])
+            batch.sort_chapter.append(row["sort_chapter"])
+            batch.sort_verse.append(row["sort_verse"])
+        return batch
+
+
+_SOURCE_COVERAGE_SQL = "SELECT commentator_key, book_id, chapter_start, chapter_end FROM entries WHERE source_id = ?"
+_DELETE_ENTRIES_SQL = "DELETE FROM entries WHERE source_id = ?"
+_DELETE_COVERAGE_SQL = "DELETE FROM coverage WHERE commentator_key=? AND book_id=? AND chapter_start=? AND chapter_end=?"
+_INSERT_ENTRY_SQL = """
+    INSERT INTO entries(
+      source_id, commentator_key, work_title, book_id, chapter_start, verse_start,
+      chapter_end, verse_end, granularity, passage_label, excerpt, sort_chapter, sort_verse, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_COVERAGE_SQL = "INSERT OR IGNORE INTO coverage(commentator_key, book_id, chapter_start, chapter_end, notes) VALUES (?, ?, ?, ?, ?)"
+
+
+def replace_entries_for_source(
+    conn: sqlite3.Connection, source_id: int, rows: Union[EntryBatch, Sequence[Mapping[str, object]]]
+) -> None:
+    batch = rows if isinstance(rows, EntryBatch) else EntryBatch.from_rows(rows)
+    existing = conn.execute(_SOURCE_COVERAGE_SQL, (source_id,))
+    cov_keys = {(r["commentator_key"], r["book_id"], r["chapter_start"], r["chapter_end"]) for r in existing.fetchall()}
+    conn.execute(_DELETE_ENTRIES_SQL, (source_id,))
+    conn.executemany(_DELETE_COVERAGE_SQL, cov_keys)
+
+    key = batch.commentator_key
+    conn.executemany(
+        _INSERT_ENTRY_SQL,
+        zip(
+            repeat(source_id),
+            repeat(key),
+            repeat(batch.work_title),
+            batch.book_id,
+            batch.chapter_start,
+            batch.verse_start,
+            batch.chapter_end,
+            batch.verse_end,
+            batch.granularity,
+            batch.passage_label,
+            batch.excerpt,
+            batch.sort_chapter,
+            batch.sort_verse,
+            repeat(utc_now()),
+        ),
+    )
+    # dict keeps first-seen order while de-duplicating coverage keys.
+    inserted_cov = dict.fromkeys(zip(repeat(key), batch.book_id, batch.chapter_start, batch.chapter_end, repeat(None)))
+    conn.executemany(_INSERT_COVERAGE_SQL, inserted_cov)
+
+
+# Every character str.strip() removes, so SQL trim() measures excerpts the way
+# score_row does. Generated with:
+#   "".join(c for c in map(chr, range(0x110000)) if c.isspace())
+_STRIP_CHARS = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+    "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
+# Ranked search: the expressions below compute exactly what score_row computes,
+# in the same floating-point operation order, so scores and ordering match the
+# Python reference bit for bit. {overlap} and {priority} are filled in per query
+# shape; everything else is bound.
+_RANKED_SQL = """
+  WITH c AS (
+    SELECT e.*, s.source_url, s.local_raw_path,
+      CASE WHEN e.verse_start THEN e.verse_start ELSE 1 END AS rv1
+    FROM entries e
+    JOIN sources s ON s.id = e.source_id
+    WHERE e.book_id = :book
+      AND e.chapter_start <= :ce
+      AND e.chapter_end >= :cs
+  ), d AS (
+    SELECT c.*, CASE WHEN c.verse_end THEN c.verse_end ELSE c.rv1 END AS rv2 FROM c
+  ), o AS (
+    SELECT d.*, {overlap} AS overlap,
+      {priority} AS pref_bonus,
+      length(trim(coalesce(d.excerpt, ''), :ws)) AS excerpt_len
+    FROM d
+  )
+  SELECT o.*,
+    CASE o.granularity WHEN 'verse' THEN 1.0 WHEN 'range' THEN 0.8 WHEN 'chapter' THEN 0.45 ELSE 0.5 END
+      + o.overlap + o.pref_bonus
+      + CASE WHEN o.excerpt_len BETWEEN 120 AND 1200 THEN 0.05 WHEN o.excerpt_len > 40 THEN 0.02 ELSE 0.0 END
+      AS score
+  FROM o
+  WHERE o.overlap > 0
+  ORDER BY score DESC, o.sort_chapter, o.sort_verse, o.id
+"""
+# Query without a verse span: only granularity matters (see _verse_overlap_score).
+_OVERLAP_CHAPTER_SQL = "CASE d.granularity WHEN 'chapter' THEN 0.2 WHEN 'range' THEN 0.35 ELSE 0.25 END"
+_OVERLAP_VERSE_SQL = """CASE
+      WHEN d.granularity = 'chapter' THEN 0.2
+      WHEN d.chapter_start != :cs OR d.chapter_end != :ce THEN 0.3
+      WHEN max(0, min(d.rv2, :q2) - max(d.rv1, :q1) + 1) <= 0 THEN 0.0
+      ELSE (CAST(max(0, min(d.rv2, :q2) - max(d.rv1, :q1) + 1) AS REAL) / max(1, :q2 - :q1 + 1)) * 0.6
+        + (CAST(max(0, min(d.rv2, :q2) - max(d.rv1, :q1) + 1) AS REAL) / max(1, d.rv2 - d.rv1 + 1)) * 0.2
+        + (CASE WHEN d.rv1 = :q1 AND d.rv2 = :q2 THEN 1.0 ELSE 0.0 END) * 0.2
+    END"""
+
+
+def _pref_bonus(rank: int) -> float:
+    return max(0.0, 0.25 - min(rank, 20) * 0.03)
+
+
+def _ranked_candidates(conn: sqlite3.Connection, p: Passage, commentator_priority: Mapping[str, int]) -> sqlite3.Cursor:
+    params: Dict[str, object] = {
+        "book": p.book_id,
+        "cs": p.chapter_start,
+        "ce": p.chapter_end,
+        "q1": p.verse_start,
+        "q2": p.verse_end,
+        "ws": _STRIP_CHARS,
+    }
+    # Commentator keys are stored lower-cased, so SQLite's ASCII lower() agrees
+    # with the str.lower() lookup score_row does.
+    whens = []
+    for i, (key, rank) in enumerate(commentator_priority.items()):
+        params[f"k{i}"] = key
+        params[f"b{i}"] = _pref_bonus(rank)
+        whens.append(f"WHEN :k{i} THEN :b{i}")
+    params["b_default"] = _pref_bonus(999)
+    priority = f"CASE lower(coalesce(d.commentator_key, '')) {' '.join(whens)} ELSE :b_default END" if whens else ":b_default"
+    overlap = _OVERLAP_CHAPTER_SQL if p.verse_start is None or p.verse_end is None else _OVERLAP_VERSE_SQL
+    return conn.execute(_RANKED_SQL.format(overlap=overlap, priority=priority), params)
 
 
 def _verse_overlap_score(p: Passage, row: sqlite3.Row) -> float:
@@ -273,52 +490,101 @@ def _verse_overlap_score(p: Passage, row: sqlite3.Row) -> float:
     return ratio * 0.6 + tight * 0.2 + exact * 0.2
 
 
+_GRANULARITY_WEIGHT = {"verse": 1.0, "range": 0.8, "chapter": 0.45}
+
+
 def score_row(row: sqlite3.Row, p: Passage, commentator_priority: Mapping[str, int]) -> float:
-    granularity_weight = {"verse": 1.0, "range": 0.8, "chapter": 0.45}.get(row["granularity"], 0.5)
+    granularity_weight = _GRANULARITY_WEIGHT.get(row["granularity"], 0.5)
     overlap = _verse_overlap_score(p, row)
     if overlap <= 0 and not (p.verse_start is None and row["granularity"] == "chapter"):
         return 0.0
     pref_rank = commentator_priority.get((row["commentator_key"] or "").lower(), 999)
-    pref_bonus = max(0.0, 0.25 - min(pref_rank, 20) * 0.03)
+    pref_bonus = _pref_bonus(pref_rank)
     excerpt_len = len((row["excerpt"] or "").strip())
     len_bonus = 0.05 if 120 <= excerpt_len <= 1200 else (0.02 if excerpt_len > 40 else 0.0)
     return granularity_weight + overlap + pref_bonus + len_bonus
 
 
-def search_entries(
-    conn: sqlite3.Connection,
-    passage: Passage,
-    commentator_priority: Mapping[str, int],
-    limit: int = 8,
-) -> List[Dict[str, object]]:
-    rows = _sql_candidates(conn, passage)
-    scored: List[Tuple[float, sqlite3.Row]] = []
-    for row in rows:
-        s = score_row(row, passage, commentator_priority)
-        if s > 0:
-            scored.append((s, row))
-    scored.sort(key=lambda x: (-x[0], x[1]["sort_chapter"], x[1]["sort_verse"], x[1]["id"]))
+def _result_dict(row: sqlite3.Row) -> Dict[str, object]:
+    return {
+        "id": row["id"],
+        "commentator": row["commentator_key"],
+        "work": row["work_title"],
+        "coverage": row["passage_label"],
+        "granularity": row["granularity"],
+        "excerpt": row["excerpt"],
+        "source_url": row["source_url"],
+        "local_raw_path": row["local_raw_path"],
+        "score": round(float(row["score"]), 4),
+    }
+
+
+def _distinct_results(rows: Iterable[sqlite3.Row], limit: int) -> List[Dict[str, object]]:
+    # Rows arrive best-first and are pulled lazily, so only as many cross into
+    # Python as it takes to collect `limit` distinct results.
     result: List[Dict[str, object]] = []
     seen = set()
-    for score, row in scored:
+    for row in rows:
         key = (row["commentator_key"], row["passage_label"], row["excerpt"][:120])
         if key in seen:
             continue
         seen.add(key)
-        result.append(
-            {
-                "id": row["id"],
-                "commentator": row["commentator_key"],
-                "work": row["work_title"],
-                "coverage": row["passage_label"],
-                "granularity": row["granularity"],
-                "excerpt": row["excerpt"],
-                "source_url": row["source_url"],
-                "local_raw_path": row["local_raw_path"],
-                "score": round(float(score), 4),
-            }
-        )
+        result.append(_result_dict(row))
         if len(result) >= limit:
             break
     return result
 
+
+def search_entries(
+    conn: sqlite3.Connection,
+    passage: Passage,
+    commentator_priority: Mapping[str, int],
+    limit: int = 8,
+) -> List[Dict[str, object]]:
+    # SQLite scores and ranks the candidates.
+    return _distinct_results(_ranked_candidates(conn, passage, commentator_priority), limit)
+
+
+_FTS_TERM_RE = re.compile(r"\w+\*?")
+
+_TEXT_SEARCH_SQL = """
+  SELECT e.*, s.source_url, s.local_raw_path, -f.rank AS score
+  FROM entries_fts f
+  JOIN entries e ON e.id = f.rowid
+  JOIN sources s ON s.id = e.source_id
+  WHERE entries_fts MATCH :match{passage}
+  ORDER BY f.rank, e.sort_chapter, e.sort_verse, e.id
+"""
+_TEXT_PASSAGE_SQL = " AND e.book_id = :book AND e.chapter_start <= :ce AND e.chapter_end >= :cs"
+
+
+def _fts_match_expression(keyword: str) -> str:
+    """Turn free text into an FTS5 query: every word must appear; a trailing * keeps prefix matching."""
+    terms = []
+    for term in _FTS_TERM_RE.findall(keyword):
+        word, star = (term[:-1], "*") if term.endswith("*") else (term, "")
+        terms.append(f'"{word}"{star}')
+    return " AND ".join(terms)
+
+
+def search_entries_text(
+    conn: sqlite3.Connection,
+    passage: Optional[Passage],
+    keyword: str,
+    limit: int = 8,
+) -> List[Dict[str, object]]:
+    """Keyword search over excerpts and passage labels, best BM25 match first.
+
+    With a passage, only entries overlapping its chapters are considered.
+    Scores are negated BM25 ranks so that, as with search_entries, higher is better.
+    """
+    match = _fts_match_expression(keyword)
+    if not match:
+        return []
+    params: Dict[str, object] = {"match": match}
+    passage_sql = ""
+    if passage is not None:
+        params.update(book=passage.book_id, cs=passage.chapter_start, ce=passage.chapter_end)
+        passage_sql = _TEXT_PASSAGE_SQL
+    rows = conn.execute(_TEXT_SEARCH_SQL.format(passage=passage_sql), params)
+    return _distinct_results(rows, limit)
@@ -4,99 +4,121 @@
 from __future__ import annotations
 
 import re
+import sys
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 BOOKS = [
-    ("Gen", "Genesis", ["gen", "ge", "gn", "genesis"]),
-    ("Exod", "Exodus", ["exod", "ex", "exo", "exodus"]),
-    ("Lev", "Leviticus", ["lev", "le", "lv", "leviticus"]),
-    ("Num", "Numbers", ["num", "nu", "nm", "numbers"]),
-    ("Deut", "Deuteronomy", ["deut", "dt", "deuteronomy"]),
-    ("Josh", "Joshua", ["josh", "jos", "joshua"]),
-    ("Judg", "Judges", ["judg", "jg", "jdg", "judges"]),
-    ("Ruth", "Ruth", ["ruth", "ru"]),
-    ("1Sam", "1 Samuel", ["1 samuel", "1 sam", "1sa", "i samuel", "first samuel"]),
-    ("2Sam", "2 Samuel", ["2 samuel", "2 sam", "2sa", "ii samuel", "second samuel"]),
-    ("1Kgs", "1 Kings", ["1 kings", "1 kgs", "1ki", "i kings", "first kings"]),
-    ("2Kgs", "2 Kings", ["2 kings", "2 kgs", "2ki", "ii kings", "second kings"]),
-    ("1Chr", "1 Chronicles", ["1 chronicles", "1 chr", "1ch", "i chronicles", "first chronicles"]),
-    ("2Chr", "2 Chronicles", ["2 chronicles", "2 chr", "2ch", "ii chronicles", "second chronicles"]),
-    ("Ezra", "Ezra", ["ezra", "ezr"]),
-    ("Neh", "Nehemiah", ["neh", "nehemiah"]),
-    ("Esth", "Esther", ["esth", "est", "esther"]),
-    ("Job", "Job", ["job"]),
-    ("Ps", "Psalms", ["ps", "psalm", "psalms", "psa"]),
-    ("Prov", "Proverbs", ["prov", "pr", "proverbs"]),
-    ("Eccl", "Ecclesiastes", ["eccl", "ecc", "ecclesiastes"]),
-    ("Song", "Song of Solomon", ["song", "song of solomon", "songs", "canticles"]),
-    ("Isa", "Isaiah", ["isa", "isaiah"]),
-    ("Jer", "Jeremiah", ["jer", "jeremiah"]),
-    ("Lam", "Lamentations", ["lam", "lamentations"]),
-    ("Ezek", "Ezekiel", ["ezek", "eze", "ezekiel"]),
-    ("Dan", "Daniel", ["dan", "daniel"]),
-    ("Hos", "Hosea", ["hos", "hosea"]),
-    ("Joel", "Joel", ["joel", "jl"]),
-    ("Amos", "Amos", ["amos", "am"]),
-    ("Obad", "Obadiah", ["obad", "ob", "obadiah"]),
-    ("Jonah", "Jonah", ["jonah", "jon"]),
-    ("Mic", "Micah", ["mic", "micah"]),
-    ("Nah", "Nahum", ["nah", "nahum"]),
-    ("Hab", "Habakkuk", ["hab", "habakkuk"]),
-    ("Zeph", "Zephaniah", ["zeph", "zep", "zephaniah"]),
-    ("Hag", "Haggai", ["hag", "haggai"]),
-    ("Zech", "Zechariah", ["zech", "zec", "zechariah"]),
-    ("Mal", "Malachi", ["mal", "malachi"]),
-    ("Matt", "Matthew", ["matt", "mt", "matthew"]),
-    ("Mark", "Mark", ["mark", "mk", "mrk"]),
-    ("Luke", "Luke", ["luke", "lk", "luk"]),
-    ("John", "John", ["john", "jn", "jhn"]),
-    ("Acts", "Acts", ["acts", "act"]),
-    ("Rom", "Romans", ["rom", "ro", "romans"]),
-    ("1Cor", "1 Corinthians", ["1 corinthians", "1 cor", "1co", "i corinthians", "first corinthians"]),
-    ("2Cor", "2 Corinthians", ["2 corinthians", "2 cor", "2co", "ii corinthians", "second corinthians"]),
-    ("Gal", "Galatians", ["gal", "ga", "galatians"]),
-    ("Eph", "Ephesians", ["eph", "ephesians"]),
-    ("Phil", "Philippians", ["phil", "php", "philippians"]),
-    ("Col", "Colossians", ["col", "colossians"]),
-    ("1Thess", "1 Thessalonians", ["1 thessalonians", "1 thess", "1th", "i thessalonians", "first thessalonians"]),
-    ("2Thess", "2 Thessalonians", ["2 thessalonians", "2 thess", "2th", "ii thessalonians", "second thessalonians"]),
-    ("1Tim", "1 Timothy", ["1 timothy", "1 tim", "1ti", "i timothy", "first timothy"]),
-    ("2Tim", "2 Timothy", ["2 timothy", "2 tim", "2ti", "ii timothy", "second timothy"]),
-    ("Titus", "Titus", ["titus", "tit"]),
-    ("Phlm", "Philemon", ["philemon", "phm", "phlm"]),
-    ("Heb", "Hebrews", ["heb", "hebrews"]),
-    ("Jas", "James", ["james", "jas", "jm"]),
-    ("1Pet", "1 Peter", ["1 peter", "1 pet", "1pe", "i peter", "first peter"]),
-    ("2Pet", "2 Peter", ["2 peter", "2 pet", "2pe", "ii peter", "second peter"]),
-    ("1John", "1 John", ["1 john", "1 jn", "1jo", "i john", "first john"]),
-    ("2John", "2 John", ["2 john", "2 jn", "2jo", "ii john", "second john"]),
-    ("3John", "3 John", ["3 john", "3 jn", "3jo", "iii john", "third john"]),
-    ("Jude", "Jude", ["jude", "jud"]),
-    ("Rev", "Revelation", ["rev", "re", "revelation", "apocalypse"]),
+    ("Gen", "Genesis", ("gen", "ge", "gn", "genesis")),
+    ("Exod", "Exodus", ("exod", "ex", "exo", "exodus")),
+    ("Lev", "Leviticus", ("lev", "le", "lv", "leviticus")),
+    ("Num", "Numbers", ("num", "nu", "nm", "numbers")),
+    ("Deut", "Deuteronomy", ("deut", "dt", "deuteronomy")),
+    ("Josh", "Joshua", ("josh", "jos", "joshua")),
+    ("Judg", "Judges", ("judg", "jg", "jdg", "judges")),
+    ("Ruth", "Ruth", ("ruth", "ru")),
+    ("1Sam", "1 Samuel", ("1 samuel", "1 sam", "1sa", "i samuel", "first samuel")),
+    ("2Sam", "2 Samuel", ("2 samuel", "2 sam", "2sa", "ii samuel", "second samuel")),
+    ("1Kgs", "1 Kings", ("1 kings", "1 kgs", "1ki", "i kings", "first kings")),
+    ("2Kgs", "2 Kings", ("2 kings", "2 kgs", "2ki", "ii kings", "second kings")),
+    ("1Chr", "1 Chronicles", ("1 chronicles", "1 chr", "1ch", "i chronicles", "first chronicles")),
+    ("2Chr", "2 Chronicles", ("2 chronicles", "2 chr", "2ch", "ii chronicles", "second chronicles")),
+    ("Ezra", "Ezra", ("ezra", "ezr")),
+    ("Neh", "Nehemiah", ("neh", "nehemiah")),
+    ("Esth", "Esther", ("esth", "est", "esther")),
+    ("Job", "Job", ("job",)),
+    ("Ps", "Psalms", ("ps", "psalm", "psalms", "psa")),
+    ("Prov", "Proverbs", ("prov", "pr", "proverbs")),
+    ("Eccl", "Ecclesiastes", ("eccl", "ecc", "ecclesiastes")),
+    ("Song", "Song of Solomon", ("song", "song of solomon", "songs", "canticles")),
+    ("Isa", "Isaiah", ("isa", "isaiah")),
+    ("Jer", "Jeremiah", ("jer", "jeremiah")),
+    ("Lam", "Lamentations", ("lam", "lamentations")),
+    ("Ezek", "Ezekiel", ("ezek", "eze", "ezekiel")),
+    ("Dan", "Daniel", ("dan", "daniel")),
+    ("Hos", "Hosea", ("hos", "hosea")),
+    ("Joel", "Joel", ("joel", "jl")),
+    ("Amos", "Amos", ("amos", "am")),
+    ("Obad", "Obadiah", ("obad", "ob", "obadiah")),
+    ("Jonah", "Jonah", ("jonah", "jon")),
+    ("Mic", "Micah", ("mic", "micah")),
+    ("Nah", "Nahum", ("nah", "nahum")),
+    ("Hab", "Habakkuk", ("hab", "habakkuk")),
+    ("Zeph", "Zephaniah", ("zeph", "zep", "zephaniah")),
+    ("Hag", "Haggai", ("hag", "haggai")),
+    ("Zech", "Zechariah", ("zech", "zec", "zechariah")),
+    ("Mal", "Malachi", ("mal", "malachi")),
+    ("Matt", "Matthew", ("matt", "mt", "matthew")),
+    ("Mark", "Mark", ("mark", "mk", "mrk")),
+    ("Luke", "Luke", ("luke", "lk", "luk")),
+    ("John", "John", ("john", "jn", "jhn")),
+    ("Acts", "Acts", ("acts", "act")),
+    ("Rom", "Romans", ("rom", "ro", "romans")),
+    ("1Cor", "1 Corinthians", ("1 corinthians", "1 cor", "1co", "i corinthians", "first corinthians")),
+    ("2Cor", "2 Corinthians", ("2 corinthians", "2 cor", "2co", "ii corinthians", "second corinthians")),
+    ("Gal", "Galatians", ("gal", "ga", "galatians")),
+    ("Eph", "Ephesians", ("eph", "ephesians")),
+    ("Phil", "Philippians", ("phil", "php", "philippians")),
+    ("Col", "Colossians", ("col", "colossians")),
+    ("1Thess", "1 Thessalonians", ("1 thessalonians", "1 thess", "1th", "i thessalonians", "first thessalonians")),
+    ("2Thess", "2 Thessalonians", ("2 thessalonians", "2 thess", "2th", "ii thessalonians", "second thessalonians")),
+    ("1Tim", "1 Timothy", ("1 timothy", "1 tim", "1ti", "i timothy", "first timothy")),
+    ("2Tim", "2 Timothy", ("2 timothy", "2 tim", "2ti", "ii timothy", "second timothy")),
+    ("Titus", "Titus", ("titus", "tit")),
+    ("Phlm", "Philemon", ("philemon", "phm", "phlm")),
+    ("Heb", "Hebrews", ("heb", "hebrews")),
+    ("Jas", "James", ("james", "jas", "jm")),
+    ("1Pet", "1 Peter", ("1 peter", "1 pet", "1pe", "i peter", "first peter")),
+    ("2Pet", "2 Peter", ("2 peter", "2 pet", "2pe", "ii peter", "second peter")),
+    ("1John", "1 John", ("1 john", "1 jn", "1jo", "i john", "first john")),
+    ("2John", "2 John", ("2 john", "2 jn", "2jo", "ii john", "second john")),
+    ("3John", "3 John", ("3 john", "3 jn", "3jo", "iii john", "third john")),
+    ("Jude", "Jude", ("jude", "jud")),
+    ("Rev", "Revelation", ("rev", "re", "revelation", "apocalypse")),
 ]
 
 BOOK_BY_ALIAS: Dict[str, Tuple[int, str, str]] = {}
 for idx, (osis, name, aliases) in enumerate(BOOKS, start=1):
-    BOOK_BY_ALIAS[name.lower()] = (idx, osis, name)
-    BOOK_BY_ALIAS[osis.lower()] = (idx, osis, name)
+    # One (id, osis, name) tuple per book, shared by all of its aliases.
+    book = (idx, osis, name)
+    BOOK_BY_ALIAS[name.lower()] = book
+    BOOK_BY_ALIAS[osis.lower()] = book
     for alias in aliases:
-        BOOK_BY_ALIAS[alias.lower()] = (idx, osis, name)
+        BOOK_BY_ALIAS[alias.lower()] = book
+
+
+_WS_RUN_RE = re.compile(r"\s+")
 
 
 def _normalize_book_phrase(s: str) -> str:
     s = s.strip().lower().replace(".", " ")
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RUN_RE.sub(" ", s)
     s = s.replace("iii ", "3 ").replace("ii ", "2 ").replace("i ", "1 ")
     return s
 
 
+# Aliases whose normalized form resolves to the same book, so a stripped,
+# lower-cased phrase that hits here needs no further normalizing.
+_BOOK_BY_PLAIN_ALIAS: Dict[str, Tuple[int, str, str]] = {
+    alias: book for alias, book in BOOK_BY_ALIAS.items() if BOOK_BY_ALIAS.get(_normalize_book_phrase(alias)) == book
+}
+
+
 def match_book(book_str: str) -> Optional[Tuple[int, str, str]]:
+    b = _BOOK_BY_PLAIN_ALIAS.get(book_str.strip().lower())
+    if b is not None:
+        return b
     return BOOK_BY_ALIAS.get(_normalize_book_phrase(book_str))
 
 
-@dataclass(frozen=True)
+# Passages are created per scanned reference; slots drop the per-instance
+# __dict__ where the interpreter supports them (Python 3.10+).
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Passage:
     book_id: int
     osis: str
@@ -132,14 +154,16 @@ PASSAGE_RE = re.compile(
     r"(?:\s*-\s*(?:(?P<c2>\d+)\:)?(?P<v2>\d+)? )?\s*$",
     re.X,
 )
+# Chapter range without verses, e.g. "Romans 8-9", tried when PASSAGE_RE fails.
+_CHAPTER_RANGE_RE = re.compile(r"^\s*(?P<book>[1-3]?\s*[A-Za-z][A-Za-z .]+?)\s+(?P<c1>\d+)\s*-\s*(?P<c2>\d+)\s*$")
+_TAIL_VERSE_RE = re.compile(r"-\s*(\d+)\s*$")
 
 
 def parse_passage(text: str, strict: bool = False) -> Passage:
     raw = text.strip()
     m = PASSAGE_RE.match(raw)
     if not m:
-        # try chapter range without verses, e.g. "Romans 8-9"
-        m2 = re.match(r"^\s*(?P<book>[1-3]?\s*[A-Za-z][A-Za-z .]+?)\s+(?P<c1>\d+)\s*-\s*(?P<c2>\d+)\s*$", raw)
+        m2 = _CHAPTER_RANGE_RE.match(raw)
         if not m2:
             raise ValueError(f"Could not parse passage reference: {text!r}")
         b = match_book(m2.group("book"))
@@ -163,7 +187,7 @@ def parse_passage(text: str, strict: bool = False) -> Passage:
         v2 = int(m.group("v2"))
     elif m.group(0).find("-") != -1 and v1 is not None and m.group("c2") is None:
         # "Rom 8:28-30"
-        v2 = int(re.search(r"-\s*(\d+)\s*$", raw).group(1))
+        v2 = int(_TAIL_VERSE_RE.search(raw).group(1))
     else:
         v2 = v1
 
@@ -234,23 +258,76 @@ VERSE_REF_SCAN_RE = re.compile(
 )
 
 
-def scan_passages_in_text(text: str, default_book: Optional[str] = None) -> List[Passage]:
+# Every reference has a "<digit>:<digit>" core, and everything a match holds
+# before its core is letters, digits, spaces and periods. A match can therefore
+# start no earlier than the last other character before the core.
+_REF_CORE_RE = re.compile(r"(?<=\d):(?=\d)")
+_REF_STOP_RE = re.compile(r"[^A-Za-z\d.\s]")
+# Longest tail after a core's colon: "ddd-ddd:ddd", plus one character so the
+# closing \b sees real text rather than the search bound.
+_REF_TAIL = 13
+
+
+def iter_verse_refs(text: str) -> Iterator[re.Match]:
+    """Yield exactly the matches VERSE_REF_SCAN_RE.finditer(text) would.
+
+    The book group's lazy run makes a plain finditer quadratic on long lines:
+    every word start rescans the rest of the sentence looking for a reference.
+    Here each search is seeded just before a "d:d" core and bounded just past
+    it, so text with no references in it is never backtracked over.
+    """
+    cores = [m.start() for m in _REF_CORE_RE.finditer(text)]
+    if not cores:
+        return
+    stops = [m.start() for m in _REF_STOP_RE.finditer(text, 0, cores[-1])]
+    search = VERSE_REF_SCAN_RE.search
+    pos = 0
+    for colon in cores:
+        if colon < pos:
+            continue
+        i = bisect_left(stops, colon)
+        start = stops[i - 1] + 1 if i and stops[i - 1] + 1 > pos else pos
+        m = search(text, start, colon + _REF_TAIL)
+        # A hit on a later core may have ended on the artificial bound; that
+        # core gets its own search.
+        if m is not None and m.end("ch") == colon:
+            yield m
+            pos = m.end()
+
+
+def _passages_in(
+    text: str, default_book: Optional[str], books: Dict[Optional[str], Optional[Tuple[int, str, str]]]
+) -> List[Passage]:
     passages: List[Passage] = []
-    for m in VERSE_REF_SCAN_RE.finditer(text):
-        book_part = m.group("book") or default_book
+    for m in iter_verse_refs(text):
+        book_part, ch, v1, ch2, v2 = m.group("book", "ch", "v1", "ch2", "v2")
+        book_part = book_part or default_book
         if not book_part:
             continue
-        b = match_book(book_part)
+        if book_part in books:
+            b = books[book_part]
+        else:
+            b = books[book_part] = match_book(book_part)
         if not b:
             continue
-        book_id, osis, book_name = b
-        c1 = int(m.group("ch"))
-        v1 = int(m.group("v1"))
-        c2 = int(m.group("ch2")) if m.group("ch2") else c1
-        v2 = int(m.group("v2")) if m.group("v2") else v1
-        try:
-            passages.append(Passage(book_id, osis, book_name, c1, v1, c2, v2))
-        except ValueError:
-            continue
+        c1 = int(ch)
+        v = int(v1)
+        passages.append(Passage(b[0], b[1], b[2], c1, v, int(ch2) if ch2 else c1, int(v2) if v2 else v))
     return passages
 
+
+def scan_passages_in_text(text: str, default_book: Optional[str] = None) -> List[Passage]:
+    if ":" not in text:
+        return []
+    return _passages_in(text, default_book, {})
+
+
+def scan_lines(lines: List[str], default_book: Optional[str] = None) -> List[List[Passage]]:
+    """Batch form of scan_passages_in_text: one passage list per input line.
+
+    Each distinct book phrase is resolved once per call instead of once per
+    match. Verse references always contain ':', so other lines skip the
+    regex entirely.
+    """
+    books: Dict[Optional[str], Optional[Tuple[int, str, str]]] = {}
+    return [_passages_in(line, default_book, books) if ":" in line else [] for line in lines]
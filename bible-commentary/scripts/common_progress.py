@@ -6,31 +6,61 @@ from __future__ import annotations
 import json
 import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+# Upper bound on how long a heartbeat can sit in the stdout buffer while the
+# loop that produced it keeps running.
+HEARTBEAT_FLUSH_INTERVAL = 0.25
+
 
 @dataclass
 class ProgressReporter:
     enabled: bool = False
     json_mode: bool = False
+    # Timestamps have one-second resolution; format each second only once.
+    _ts_second: int = field(default=-1, init=False, repr=False, compare=False)
+    _ts: str = field(default="", init=False, repr=False, compare=False)
+    _last_flush: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def _timestamp(self) -> str:
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_second = now
+            self._ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        return self._ts
 
     def emit(self, phase: str, message: str, **extra: Any) -> None:
-        if not self.enabled:
-            return
-        ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        if self.enabled:
+            self._write(self._format(phase, message, extra), flush=True)
+
+    def heartbeat_every(self, count: int, every: int, phase: str, message: str) -> None:
+        """Report loop progress every `every` items.
+
+        Heartbeats are written as they happen but flushed at most every
+        HEARTBEAT_FLUSH_INTERVAL seconds; the next emit(), or interpreter exit,
+        pushes out whatever is still pending.
+        """
+        if self.enabled and every > 0 and count % every == 0:
+            flush = time.monotonic() - self._last_flush >= HEARTBEAT_FLUSH_INTERVAL
+            self._write(self._format(phase, message, {"count": count}), flush=flush)
+
+    def _format(self, phase: str, message: str, extra: Dict[str, Any]) -> str:
+        ts = self._timestamp()
         if self.json_mode:
             payload: Dict[str, Any] = {"ts": ts, "phase": phase, "message": message}
             payload.update(extra)
-            print(json.dumps(payload), flush=True)
-            return
-        tail = ""
+            return json.dumps(payload)
         if extra:
             formatted = " ".join(f"{k}={v}" for k, v in extra.items())
-            tail = f" ({formatted})"
-        print(f"{phase}: {message}{tail}", flush=True)
-
-    def heartbeat_every(self, count: int, every: int, phase: str, message: str) -> None:
-        if every > 0 and count % every == 0:
-            self.emit(phase, message, count=count)
+            return f"{phase}: {message} ({formatted})"
+        return f"{phase}: {message}"
 
+    def _write(self, line: str, flush: bool) -> None:
+        # One write per event (print() issues the text and the newline
+        # separately); sys.stdout is looked up each time so redirection works.
+        out = sys.stdout
+        out.write(line + "\n")
+        if flush:
+            out.flush()
+            self._last_flush = time.monotonic()
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import argparse
+import glob
 import hashlib
 import json
 import os
@@ -11,9 +12,11 @@ import re
 import subprocess
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from html import unescape
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from common_passages import BOOKS, match_book, parse_passage, scan_passages_in_text
 
@@ -151,8 +154,45 @@ JG_PREFIX_BOOK = {
 }
 
 
+_SCRIPT_RE = re.compile(r"<script.*?>.*?</script>", re.I | re.S)
+_STYLE_RE = re.compile(r"<style.*?>.*?</style>", re.I | re.S)
+_BREAK_TAG_RE = re.compile(r"<br\s*/?>|</p>|</div>", re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+_HSPACE_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# Every byte except ASCII letters, for counting letters with bytes.translate().
+_NON_ASCII_LETTER_BYTES = bytes(b for b in range(256) if not (65 <= b <= 90 or 97 <= b <= 122))
+_MH_FILE_RE = re.compile(r"MHC(\d{2})(\d{3})\.HTM$", re.I)
+_JFB_FILE_RE = re.compile(r"JFB(\d{2})\.HTM$", re.I)
+_JG_CHAPTER_FILE_RE = re.compile(r"([a-z]{2,3}\d?|[a-z]{3})(\d{3})$")
+_JG_BOOK_FILE_RE = re.compile(r"([a-z]{2,3}\d?|[a-z]{3})$")
+_VERSE_HEADING_RE = re.compile(r"\bVerse\s+(\d{1,3})\b", re.I)
+# Calvin TOC/index lines: a dot leader ending in a page number, or a contents
+# or index heading. Every alternative starts with '.', 't' or 'i'; spelling
+# that out as a lookahead lets the search skip all other positions.
+_TOC_LINE_RE = re.compile(r"(?=[.TtIi])(?:\.{3,}\s*p\.\s*\d+\s*$|\btable of contents\b|\bindexes?\b|\bindex of scripture\b)", re.I)
+_TOC_PAGE_RE = re.compile(r"\bp\.\s*\d+\b", re.I)
+_VOL_RE = re.compile(r"\bvol\s*\d+\b")
+_DIATHEKE_LINE_RE = re.compile(r"^([1-3]?\s*[A-Za-z][A-Za-z ]+?)\s+(\d+):(\d+):\s*(.*)$")
+
+# json.dumps() builds a new encoder per call whenever an option is non-default.
+_JSONL_ENCODER = json.JSONEncoder(ensure_ascii=False)
+JSONL_WRITE_BUFFER = 1 << 20
+EXTRACT_WORKERS = os.cpu_count() or 1
+EXTRACT_CHUNKSIZE = 16
+DIATHEKE_WORKERS = 8
+
+_utc_now_cache: Tuple[int, str] = (-1, "")
+
+
 def utc_now() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    # Called once per record; the timestamp has one-second resolution, so
+    # format each second only once.
+    global _utc_now_cache
+    now = int(time.time())
+    if now != _utc_now_cache[0]:
+        _utc_now_cache = (now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)))
+    return _utc_now_cache[1]
 
 
 def ensure_dir(path: Path) -> None:
@@ -160,20 +200,20 @@ def ensure_dir(path: Path) -> None:
 
 
 def strip_html(raw: str) -> str:
-    text = re.sub(r"(?is)<script.*?>.*?</script>", " ", raw)
-    text = re.sub(r"(?is)<style.*?>.*?</style>", " ", text)
-    text = re.sub(r"(?i)<br\s*/?>", "\n", text)
-    text = re.sub(r"(?i)</p>", "\n", text)
-    text = re.sub(r"(?i)</div>", "\n", text)
-    text = re.sub(r"(?is)<[^>]+>", " ", text)
+    text = _SCRIPT_RE.sub(" ", raw)
+    text = _STYLE_RE.sub(" ", text)
+    text = _BREAK_TAG_RE.sub("\n", text)
+    text = _TAG_RE.sub(" ", text)
     text = unescape(text)
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _HSPACE_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
 
 def norm_excerpt(text: str, max_len: int = 1400) -> str:
-    text = re.sub(r"\s+", " ", text.strip())
+    # str.split() and re's \s agree on what whitespace is; split/join
+    # collapses every run without a regex pass.
+    text = " ".join(text.split())
     if len(text) <= max_len:
         return text
     cut = text[: max_len - 1]
@@ -238,7 +278,7 @@ def make_record(
 
 
 def infer_mh_book_chapter(path: Path) -> Tuple[Optional[str], Optional[int]]:
-    m = re.match(r"MHC(\d{2})(\d{3})\.HTM$", path.name, re.I)
+    m = _MH_FILE_RE.match(path.name)
     if not m:
         return None, None
     bno = int(m.group(1))
@@ -250,7 +290,7 @@ def infer_mh_book_chapter(path: Path) -> Tuple[Optional[str], Optional[int]]:
 
 
 def infer_jfb_book(path: Path) -> Optional[str]:
-    m = re.match(r"JFB(\d{2})\.HTM$", path.name, re.I)
+    m = _JFB_FILE_RE.match(path.name)
     if not m:
         return None
     idx = int(m.group(1))
@@ -262,39 +302,48 @@ def infer_jfb_book(path: Path) -> Optional[str]:
 
 def infer_jg_book_chapter(path: Path) -> Tuple[Optional[str], Optional[int]]:
     name = path.stem.lower()
-    m = re.match(r"([a-z]{2,3}\d?|[a-z]{3})(\d{3})$", name)
+    m = _JG_CHAPTER_FILE_RE.match(name)
     if m:
         pref = m.group(1)
         ch = int(m.group(2))
         return JG_PREFIX_BOOK.get(pref), ch if ch > 0 else None
-    m2 = re.match(r"([a-z]{2,3}\d?|[a-z]{3})$", name)
+    m2 = _JG_BOOK_FILE_RE.match(name)
     if m2:
         return JG_PREFIX_BOOK.get(m2.group(1)), None
     return None, None
 
 
-def _chunk_text(lines: List[str], start: int, max_lines: int = 8) -> str:
+def _chunk_text(lines: List[str], has_ref: List[bool], start: int, max_lines: int = 8) -> str:
     out = [lines[start]]
     for j in range(start + 1, min(len(lines), start + max_lines)):
-        if scan_passages_in_text(lines[j]):
+        if has_ref[j]:
             break
         out.append(lines[j])
     return " ".join(out)
 
 
 def extract_records_from_html(src_key: str, source_path: Path, default_book: Optional[str], default_chapter: Optional[int]) -> List[dict]:
-    raw = source_path.read_text("utf-8", errors="ignore")
+    # Line endings are left as-is; everything below splits with splitlines().
+    raw = source_path.read_bytes().decode("utf-8", "ignore")
     text = strip_html(raw)
     lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
     base_url = SOURCE_DEFAULTS[src_key].get("source_base_record_url")
     source_record_url = (base_url + source_path.name) if base_url else None
     records: List[dict] = []
 
+    # Scan each line once. A chunk ends at the next line with a book-qualified
+    # reference; those are a subset of the hits found with default_book.
+    hits = [scan_passages_in_text(ln, default_book=default_book) for ln in lines]
+    if default_book:
+        has_ref = [bool(h) and bool(scan_passages_in_text(ln)) for h, ln in zip(hits, lines)]
+    else:
+        has_ref = [bool(h) for h in hits]
+
     # Reference-based extraction
     for i, line in enumerate(lines):
-        found = scan_passages_in_text(line, default_book=default_book)
+        found = hits[i]
         if not found and default_book and default_chapter:
-            m = re.search(r"\bVerse\s+(\d{1,3})\b", line, re.I)
+            m = _VERSE_HEADING_RE.search(line)
             if m:
                 try:
                     found = [parse_passage(f"{default_book} {default_chapter}:{int(m.group(1))}")]
@@ -302,7 +351,7 @@ def extract_records_from_html(src_key: str, source_path: Path, default_book: Opt
                     found = []
         if not found:
             continue
-        excerpt = _chunk_text(lines, i)
+        excerpt = _chunk_text(lines, has_ref, i)
         for p in found[:3]:
             records.append(
                 make_record(
@@ -353,32 +402,44 @@ def extract_records_from_html(src_key: str, source_path: Path, default_book: Opt
     ]
 
 
-def extract_records_from_calvin_pdf(source_path: Path) -> List[dict]:
+def extract_records_from_calvin_pdf(source_path: Path, cache_dir: Optional[Path] = None) -> List[dict]:
     def _is_toc_like(line: str) -> bool:
         # Examples: "Acts 1:1-2 . . . . . . . p. 16"
-        if re.search(r"\.{3,}\s*p\.\s*\d+\s*$", line, re.I):
-            return True
-        if line.count(".") >= 8 and re.search(r"\bp\.\s*\d+\b", line, re.I):
+        if _TOC_LINE_RE.search(line):
             return True
-        if re.search(r"\btable of contents\b", line, re.I):
-            return True
-        if re.search(r"\bindexes?\b|\bindex of scripture\b", line, re.I):
+        if line.count(".") >= 8 and _TOC_PAGE_RE.search(line):
             return True
         return False
 
     def _run_pdftotext(pdf_path: Path) -> str:
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
+        # The extracted text depends only on the PDF, so a copy keyed on its
+        # mtime and size lets re-runs skip pdftotext entirely.
+        cached = None
+        if cache_dir is not None:
+            st = pdf_path.stat()
+            cached = cache_dir / f"{pdf_path.name}.{st.st_mtime_ns}.{st.st_size}.txt"
+            if cached.is_file():
+                return cached.read_bytes().decode("utf-8", "ignore")
+            ensure_dir(cache_dir)
+        with tempfile.NamedTemporaryFile(suffix=".txt", dir=cache_dir, delete=False) as tmp:
             tmp_path = tmp.name
         try:
             cp = subprocess.run(
                 ["pdftotext", "-layout", "-nopgbrk", str(pdf_path), tmp_path],
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
             )
             if cp.returncode != 0:
-                err = (cp.stderr or cp.stdout or "").strip()
+                err = (cp.stderr or "").strip()
                 raise RuntimeError(err or "pdftotext failed")
-            return Path(tmp_path).read_text("utf-8", errors="ignore")
+            txt = Path(tmp_path).read_bytes().decode("utf-8", "ignore")
+            if cached is not None:
+                os.replace(tmp_path, cached)
+                for stale in cache_dir.glob(f"{glob.escape(pdf_path.name)}.*.txt"):
+                    if stale != cached:
+                        stale.unlink()
+            return txt
         finally:
             try:
                 os.unlink(tmp_path)
@@ -389,7 +450,7 @@ def extract_records_from_calvin_pdf(source_path: Path) -> List[dict]:
         base = name.lower().replace(".pdf", "")
         if "commentary on " in base:
             base = base.split("commentary on ", 1)[1]
-        base = re.sub(r"\bvol\s*\d+\b", " ", base)
+        base = _VOL_RE.sub(" ", base)
         base = base.replace(" and ", " ").replace(",", " ")
         tokens = [t.strip() for t in base.split() if t.strip()]
         out: List[str] = []
@@ -452,22 +513,25 @@ def extract_records_from_calvin_pdf(source_path: Path) -> List[dict]:
     default_books = _default_books_from_filename(source_path.name)
     default_book = default_books[0] if len(default_books) == 1 else None
 
+    # Classify every line once; the excerpt window below looks ahead up to 17
+    # lines from each reference and would otherwise re-run both checks.
+    toc = [_is_toc_like(ln) for ln in lines]
+    hits = [[] if is_toc else scan_passages_in_text(ln, default_book=default_book) for ln, is_toc in zip(lines, toc)]
+
     records: List[dict] = []
     for i, line in enumerate(lines):
-        if _is_toc_like(line):
-            continue
-        found = scan_passages_in_text(line, default_book=default_book)
+        found = hits[i]
         if not found:
             continue
         chunk = [line]
         for j in range(i + 1, min(i + 18, len(lines))):
-            if scan_passages_in_text(lines[j], default_book=default_book) and not _is_toc_like(lines[j]):
-                break
-            if _is_toc_like(lines[j]):
+            if toc[j]:
                 continue
+            if hits[j]:
+                break
             chunk.append(lines[j])
         excerpt = " ".join(chunk)
-        if len(re.sub(r"[^A-Za-z]+", "", excerpt)) < 80:
+        if len(excerpt.encode("ascii", "ignore").translate(None, _NON_ASCII_LETTER_BYTES)) < 80:
             # Skip likely heading/index fragments with no meaningful commentary text.
             continue
         for p in found[:3]:
@@ -521,70 +585,102 @@ def extract_records_from_calvin_pdf(source_path: Path) -> List[dict]:
 
 def extract_records_from_ac_sword(ac_root: Path) -> List[dict]:
     diatheke = os.environ.get("DIATHEKE_BIN", "diatheke")
-    sword_path = str(ac_root)
+    env = {**os.environ, "SWORD_PATH": str(ac_root)}
+    source_path = ac_root / "mods.d" / "clarke.conf"
 
     def _clean_osis_text(s: str) -> str:
-        # Strip simple XML/OSIS tags from diatheke output.
-        s = re.sub(r"(?is)<[^>]+>", " ", s)
+        # Strip simple XML/OSIS tags from diatheke output. unescape() already
+        # returns early when there is no '&'.
+        if "<" in s:
+            s = _TAG_RE.sub(" ", s)
         s = unescape(s)
-        s = re.sub(r"\s+", " ", s).strip()
+        s = " ".join(s.split())
         return s
 
-    # canonical book names from common_passages.BOOKS
-    canonical_books = [name for _, name, _ in BOOKS]
-    records: List[dict] = []
-    for book_name in canonical_books:
+    def _read_book(book_name: str) -> Optional[str]:
         cp = subprocess.run(
             [diatheke, "-b", "Clarke", "-k", book_name],
-            env={**os.environ, "SWORD_PATH": sword_path},
+            env=env,
             capture_output=True,
             text=True,
         )
         if cp.returncode != 0:
-            continue
-        raw = cp.stdout or ""
-        for line in raw.splitlines():
-            line = line.strip()
-            if not line or line == "(Clarke)":
-                continue
-            m = re.match(r"^([1-3]?\s*[A-Za-z][A-Za-z ]+?)\s+(\d+):(\d+):\s*(.*)$", line)
-            if not m:
-                continue
-            ref_book = m.group(1).strip()
-            ch = int(m.group(2))
-            vs = int(m.group(3))
-            body = _clean_osis_text(m.group(4))
-            if not body:
-                continue
-            try:
-                p = parse_passage(f"{ref_book} {ch}:{vs}")
-            except Exception:
+            return None
+        return cp.stdout or ""
+
+    # canonical book names from common_passages.BOOKS
+    canonical_books = [name for _, name, _ in BOOKS]
+    records: List[dict] = []
+    # One diatheke process per book, run concurrently; map() keeps book order.
+    with ThreadPoolExecutor(max_workers=DIATHEKE_WORKERS) as ex:
+        for raw in ex.map(_read_book, canonical_books):
+            if raw is None:
                 continue
-            source_path = ac_root / "mods.d" / "clarke.conf"
-            records.append(
-                make_record(
-                    src_key="ac",
-                    source_path=source_path,
-                    text=body,
-                    coverage=p.normalized_label(),
-                    p=p,
-                    confidence=0.95,
-                    source_record_url=None,
-                    notes="Extracted from local SWORD module via diatheke.",
+            for line in raw.splitlines():
+                line = line.strip()
+                if not line or line == "(Clarke)":
+                    continue
+                m = _DIATHEKE_LINE_RE.match(line)
+                if not m:
+                    continue
+                ref_book = m.group(1).strip()
+                ch = int(m.group(2))
+                vs = int(m.group(3))
+                body = _clean_osis_text(m.group(4))
+                if not body:
+                    continue
+                try:
+                    p = parse_passage(f"{ref_book} {ch}:{vs}")
+                except Exception:
+                    continue
+                records.append(
+                    make_record(
+                        src_key="ac",
+                        source_path=source_path,
+                        text=body,
+                        coverage=p.normalized_label(),
+                        p=p,
+                        confidence=0.95,
+                        source_record_url=None,
+                        notes="Extracted from local SWORD module via diatheke.",
+                    )
                 )
-            )
     return records
 
 
 def write_jsonl(path: Path, records: Iterable[dict]) -> int:
+    # records may be produced lazily while writing; the previous file stays in
+    # place until every record has been written.
     count = 0
-    with path.open("w", encoding="utf-8") as f:
-        for rec in records:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-            count += 1
+    encode = _JSONL_ENCODER.encode
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8", buffering=JSONL_WRITE_BUFFER) as f:
+            for rec in records:
+                f.write(encode(rec) + "\n")
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
     return count
 
 
+def _write_json(path: Path, payload: dict) -> None:
+    # Encode in one go (json.dump streams indented output piece by piece) and
+    # leave the file, and its mtime, alone when the content is unchanged.
+    text = json.dumps(payload, indent=2)
+    try:
+        if path.read_text("utf-8") == text:
+            return
+    except OSError:
+        pass
+    path.write_text(text, encoding="utf-8")
+
+
 def write_schema(path: Path) -> None:
     schema = {
         "$schema": "https://json-schema.org/draft/2020-12/schema",
@@ -641,8 +737,7 @@ def write_schema(path: Path) -> None:
         },
         "additionalProperties": True,
     }
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(schema, f, indent=2)
+    _write_json(path, schema)
 
 
 def write_manifest(path: Path, key: str, source_dir: Path, record_count: int) -> None:
@@ -653,8 +748,7 @@ def write_manifest(path: Path, key: str, source_dir: Path, record_count: int) ->
         "source_dir": str(source_dir),
         "source": SOURCE_DEFAULTS[key],
     }
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    _write_json(path, payload)
 
 
 def read_readme_sources(readme: Path) -> Dict[str, str]:
@@ -682,8 +776,39 @@ def apply_readme_overrides(readme_sources: Dict[str, str]) -> None:
             SOURCE_DEFAULTS[key]["source_retrieval_url"] = url
 
 
+def _extract_mh_file(path: Path) -> List[dict]:
+    book, ch = infer_mh_book_chapter(path)
+    return extract_records_from_html("mh", path, book, ch)
+
+
+def _extract_jg_file(path: Path) -> List[dict]:
+    book, ch = infer_jg_book_chapter(path)
+    return extract_records_from_html("jg", path, book, ch)
+
+
+def _extract_jfb_file(path: Path) -> List[dict]:
+    return extract_records_from_html("jfb", path, infer_jfb_book(path), None)
+
+
+def _unique_by_id(records: Iterable[dict]) -> Iterator[dict]:
+    # Overlapping references in one file can yield the same excerpt for the
+    # same coverage more than once; only the first copy is written.
+    seen = set()
+    for rec in records:
+        rid = rec["id"]
+        if rid not in seen:
+            seen.add(rid)
+            yield rec
+
+
+def _extract_pool(readme_sources: Dict[str, str]) -> ProcessPoolExecutor:
+    """Worker processes for per-file HTML extraction, with the README overrides applied in each."""
+    return ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, initializer=apply_readme_overrides, initargs=(readme_sources,))
+
+
 def export_all(output_root: Path, readme: Path, only: Optional[Sequence[str]] = None) -> Dict[str, int]:
-    apply_readme_overrides(read_readme_sources(readme))
+    readme_sources = read_readme_sources(readme)
+    apply_readme_overrides(readme_sources)
     selected = set(only or ("mh", "jg", "jfb", "jc", "ac"))
 
     ensure_dir(output_root)
@@ -694,50 +819,45 @@ def export_all(output_root: Path, readme: Path, only: Optional[Sequence[str]] =
 
     counts: Dict[str, int] = {}
 
-    # Matthew Henry
-    if "mh" in selected:
-        mh_dir = COMMENTARIES_ROOT / "mh"
-        mh_records: List[dict] = []
-        for p in sorted(mh_dir.glob("*.HTM")):
-            book, ch = infer_mh_book_chapter(p)
-            mh_records.extend(extract_records_from_html("mh", p, book, ch))
-        counts["mh"] = write_jsonl(output_root / "mh" / "records.jsonl", mh_records)
-        write_manifest(output_root / "manifests" / "mh.json", "mh", mh_dir, counts["mh"])
-
-    # John Gill
-    if "jg" in selected:
-        jg_dir = COMMENTARIES_ROOT / "jg"
-        jg_records: List[dict] = []
-        for p in sorted(jg_dir.glob("*.html")):
-            book, ch = infer_jg_book_chapter(p)
-            jg_records.extend(extract_records_from_html("jg", p, book, ch))
-        counts["jg"] = write_jsonl(output_root / "jg" / "records.jsonl", jg_records)
-        write_manifest(output_root / "manifests" / "jg.json", "jg", jg_dir, counts["jg"])
-
-    # JFB
-    if "jfb" in selected:
-        jfb_dir = COMMENTARIES_ROOT / "jfb"
-        jfb_records: List[dict] = []
-        for p in sorted(jfb_dir.glob("*.htm")) + sorted(jfb_dir.glob("*.HTM")):
-            book = infer_jfb_book(p)
-            jfb_records.extend(extract_records_from_html("jfb", p, book, None))
-        counts["jfb"] = write_jsonl(output_root / "jfb" / "records.jsonl", jfb_records)
-        write_manifest(output_root / "manifests" / "jfb.json", "jfb", jfb_dir, counts["jfb"])
+    # Each HTML file is extracted independently; map() keeps file order, and
+    # records are written as each file's results come back.
+    with _extract_pool(readme_sources) as pool:
+        # Matthew Henry
+        if "mh" in selected:
+            mh_dir = COMMENTARIES_ROOT / "mh"
+            mh_records = chain.from_iterable(pool.map(_extract_mh_file, sorted(mh_dir.glob("*.HTM")), chunksize=EXTRACT_CHUNKSIZE))
+            counts["mh"] = write_jsonl(output_root / "mh" / "records.jsonl", _unique_by_id(mh_records))
+            write_manifest(output_root / "manifests" / "mh.json", "mh", mh_dir, counts["mh"])
+
+        # John Gill
+        if "jg" in selected:
+            jg_dir = COMMENTARIES_ROOT / "jg"
+            jg_records = chain.from_iterable(pool.map(_extract_jg_file, sorted(jg_dir.glob("*.html")), chunksize=EXTRACT_CHUNKSIZE))
+            counts["jg"] = write_jsonl(output_root / "jg" / "records.jsonl", _unique_by_id(jg_records))
+            write_manifest(output_root / "manifests" / "jg.json", "jg", jg_dir, counts["jg"])
+
+        # JFB
+        if "jfb" in selected:
+            jfb_dir = COMMENTARIES_ROOT / "jfb"
+            jfb_files = sorted(jfb_dir.glob("*.htm")) + sorted(jfb_dir.glob("*.HTM"))
+            jfb_records = chain.from_iterable(pool.map(_extract_jfb_file, jfb_files, chunksize=EXTRACT_CHUNKSIZE))
+            counts["jfb"] = write_jsonl(output_root / "jfb" / "records.jsonl", _unique_by_id(jfb_records))
+            write_manifest(output_root / "manifests" / "jfb.json", "jfb", jfb_dir, counts["jfb"])
 
     # John Calvin
     if "jc" in selected:
         jc_dir = COMMENTARIES_ROOT / "jc" / "jc_commentaries"
-        jc_records: List[dict] = []
-        for p in sorted(jc_dir.glob("*.pdf")) + sorted(jc_dir.glob("*.PDF")):
-            jc_records.extend(extract_records_from_calvin_pdf(p))
-        counts["jc"] = write_jsonl(output_root / "jc" / "records.jsonl", jc_records)
+        jc_text_cache = COMMENTARIES_ROOT / ".cache" / "pdftotext"
+        jc_files = sorted(jc_dir.glob("*.pdf")) + sorted(jc_dir.glob("*.PDF"))
+        jc_records = chain.from_iterable(extract_records_from_calvin_pdf(p, cache_dir=jc_text_cache) for p in jc_files)
+        counts["jc"] = write_jsonl(output_root / "jc" / "records.jsonl", _unique_by_id(jc_records))
         write_manifest(output_root / "manifests" / "jc.json", "jc", jc_dir, counts["jc"])
 
     # Adam Clarke (SWORD module)
     if "ac" in selected:
         ac_dir = COMMENTARIES_ROOT / "ac"
         ac_records = extract_records_from_ac_sword(ac_dir)
-        counts["ac"] = write_jsonl(output_root / "ac" / "records.jsonl", ac_records)
+        counts["ac"] = write_jsonl(output_root / "ac" / "records.jsonl", _unique_by_id(ac_records))
         write_manifest(output_root / "manifests" / "ac.json", "ac", ac_dir, counts["ac"])
 
     write_schema(output_root / "schemas" / "commentary_record.schema.json")
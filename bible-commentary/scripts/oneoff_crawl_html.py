@@ -15,19 +15,21 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import http.client
 import json
 import os
 import posixpath
 import re
+import threading
 import time
 import urllib.error
 import urllib.parse
-import urllib.request
 import zipfile
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from html.parser import HTMLParser
-from typing import Dict, Iterable, List, Optional, Set
+from html import unescape
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
 DEFAULT_UA = (
@@ -35,19 +37,64 @@ DEFAULT_UA = (
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/126.0.0.0 Safari/537.36"
 )
+MAX_REDIRECTS = 5
+READ_CHUNK = 1 << 16
+
+ConnKey = Tuple[str, str, Optional[int]]
+
+# Keep-alive connections keyed by (scheme, host, port), so a crawl of one site
+# pays for the TCP/TLS handshake once per worker thread rather than per page.
+# http.client connections are not thread-safe, hence one pool per thread.
+_LOCAL = threading.local()
+
+_DUP_SLASH_RE = re.compile(r"/{2,}")
+# http(s) URLs that normalize_url() would return unchanged, bar a "//" in the
+# path (checked separately): lowercase host, non-empty path, no fragment, no
+# whitespace and no dangling "?".
+_CANONICAL_URL_RE = re.compile(r"https?://[a-z0-9.\-]+(?::[0-9]+)?/[^#\s]*(?<!\?)")
+_LEADING_DOTS_RE = re.compile(r"^\.+/")
+_DOT_SEGMENT_RE = re.compile(r"/\.+/")
+
+# Markup tokens, split roughly along HTMLParser's lines so that anchors inside
+# comments, CDATA/marked sections, declarations, processing instructions, end
+# tags, other tags' attribute values and script/style bodies are not picked up.
+# Quoted attribute values may contain ">". Only the last alternative captures:
+# group 2 is a start tag's name and group 3 its attribute text.
+_MARKUP_SCAN_RE = re.compile(
+    r"""<!--.*?(?:--\s*>|\Z)"""
+    r"""|<!\[\s*(?:cdata|temp|rcdata|ignore|include)(?![-_.a-z0-9]).*?(?:\]\s*\]\s*>|\Z)"""
+    r"""|<!\[\s*(?:if|else|endif)(?![-_.a-z0-9]).*?(?:\]\s*>|\Z)"""
+    r"""|<[!?/].*?(?:>|\Z)"""
+    r"""|<(script|style)(?=[\t\n\r\f />]).*?(?:</\s*\1\s*>|\Z)"""
+    r"""|<([a-z][^\t\n\r\f />\x00]*)((?:[^>"']|"[^"]*"|'[^']*'|["'])*)>""",
+    re.I | re.S,
+)
+# One attribute (name, optional value), as in HTMLParser's attrfind_tolerant.
+_ATTR_RE = re.compile(r"""([^\s/>][^\s/=>]*)(?:\s*=+\s*('[^']*'|"[^"]*"|(?!['"])[^>\s]*))?""")
 
 
-class LinkParser(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
-        self.links: List[str] = []
+def _anchor_hrefs(html: str) -> Iterator[str]:
+    """Yield the first non-empty href of each <a> tag, unescaped and stripped.
 
-    def handle_starttag(self, tag: str, attrs) -> None:
-        if tag.lower() != "a":
-            return
-        for k, v in attrs:
-            if k.lower() == "href" and v:
-                self.links.append(v.strip())
+    Matches what HTMLParser reports for well-formed and commonly broken pages;
+    heavily malformed markup can still tokenize differently.
+    """
+    for m in _MARKUP_SCAN_RE.finditer(html):
+        tag = m.group(2)
+        if tag is None or tag not in ("a", "A"):
+            continue
+        attrs = m.group(3)
+        if "=" not in attrs:
+            continue
+        for name, value in _ATTR_RE.findall(attrs):
+            if name.lower() != "href" or not value:
+                continue
+            if value[0] in "'\"" and value[-1] == value[0]:
+                value = value[1:-1]
+            if "&" in value:
+                value = unescape(value)
+            if value:
+                yield value.strip()
                 break
 
 
@@ -63,12 +110,15 @@ class CrawlResult:
 
 
 def normalize_url(url: str) -> str:
+    if _CANONICAL_URL_RE.fullmatch(url) and url.find("//", 8) == -1:
+        return url
     parsed = urllib.parse.urlsplit(url)
     scheme = parsed.scheme.lower()
     netloc = parsed.netloc.lower()
     path = parsed.path or "/"
     # collapse duplicate slashes
-    path = re.sub(r"/{2,}", "/", path)
+    if "//" in path:
+        path = _DUP_SLASH_RE.sub("/", path)
     return urllib.parse.urlunsplit((scheme, netloc, path, parsed.query, ""))
 
 
@@ -82,8 +132,11 @@ def safe_local_path(root: str, base: str, url: str) -> str:
     if not rel.lower().endswith(".html"):
         rel = rel + ".html"
     rel = rel.replace("\\", "/")
-    rel = re.sub(r"^\.+/", "", rel)
-    rel = re.sub(r"/\.+/", "/", rel)
+    # Most URLs have no dot segments; skip the regex passes for them.
+    if rel.startswith("."):
+        rel = _LEADING_DOTS_RE.sub("", rel)
+    if "/." in rel:
+        rel = _DOT_SEGMENT_RE.sub("/", rel)
     rel = rel.lstrip("/")
     full = os.path.abspath(os.path.join(root, rel))
     root_abs = os.path.abspath(root)
@@ -93,10 +146,8 @@ def safe_local_path(root: str, base: str, url: str) -> str:
 
 
 def extract_links(html: str, page_url: str, allowed_prefix: str) -> List[str]:
-    parser = LinkParser()
-    parser.feed(html)
     out: List[str] = []
-    for href in parser.links:
+    for href in _anchor_hrefs(html):
         if href.startswith(("javascript:", "mailto:", "tel:", "#")):
             continue
         joined = urllib.parse.urljoin(page_url, href)
@@ -105,28 +156,95 @@ def extract_links(html: str, page_url: str, allowed_prefix: str) -> List[str]:
             continue
         out.append(joined)
     # preserve order while deduping
-    seen: Set[str] = set()
-    ordered: List[str] = []
-    for u in out:
-        if u in seen:
-            continue
-        seen.add(u)
-        ordered.append(u)
-    return ordered
-
-
-def fetch_url(url: str, timeout: int, user_agent: str, cookie_header: str, referer: Optional[str]) -> tuple[int, str, bytes]:
+    return list(dict.fromkeys(out))
+
+
+def _pool() -> Dict[ConnKey, http.client.HTTPConnection]:
+    pool = getattr(_LOCAL, "pool", None)
+    if pool is None:
+        pool = _LOCAL.pool = {}
+    return pool
+
+
+def _get_conn(scheme: str, host: str, port: Optional[int], timeout: int) -> http.client.HTTPConnection:
+    pool = _pool()
+    key = (scheme, host, port)
+    conn = pool.get(key)
+    if conn is None:
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(host, port, timeout=timeout)
+        pool[key] = conn
+    return conn
+
+
+def _drop_conn(scheme: str, host: str, port: Optional[int]) -> None:
+    conn = _pool().pop((scheme, host, port), None)
+    if conn is not None:
+        conn.close()
+
+
+def _read_body(resp: http.client.HTTPResponse) -> Tuple[bytes, str]:
+    """Read the whole response body, hashing it with SHA-256 as it arrives."""
+    hasher = hashlib.sha256()
+    chunks: List[bytes] = []
+    while True:
+        chunk = resp.read(READ_CHUNK)
+        if not chunk:
+            break
+        hasher.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), hasher.hexdigest()
+
+
+def fetch_url(
+    url: str, timeout: int, user_agent: str, cookie_header: str, referer: Optional[str]
+) -> Tuple[int, str, bytes, str]:
+    """GET ``url`` over this thread's keep-alive connection, following redirects.
+
+    Returns (status, content type, body, body SHA-256 hex digest); the body is
+    hashed on the fetching thread as it is read. Failures surface as
+    urllib.error.HTTPError/URLError, as with urlopen().
+    """
     headers = {"User-Agent": user_agent}
     if cookie_header:
         headers["Cookie"] = cookie_header
     if referer:
         headers["Referer"] = referer
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        status = int(resp.getcode() or 200)
-        ctype = str(resp.headers.get("Content-Type", ""))
-        body = resp.read()
-    return status, ctype, body
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise urllib.error.URLError(f"unsupported URL: {url}")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        key = (parts.scheme, parts.hostname, parts.port)
+        for attempt in range(2):
+            conn = _get_conn(*key, timeout=timeout)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body, digest = _read_body(resp)
+                break
+            except (
+                http.client.BadStatusLine,
+                http.client.ImproperConnectionState,
+                ConnectionResetError,
+                BrokenPipeError,
+            ) as exc:
+                # The server closed the idle connection; reconnect once.
+                _drop_conn(*key)
+                if attempt:
+                    raise urllib.error.URLError(exc) from exc
+            except (OSError, http.client.HTTPException) as exc:
+                _drop_conn(*key)
+                raise urllib.error.URLError(exc) from exc
+        if resp.status in {301, 302, 303, 307, 308} and resp.getheader("Location"):
+            url = urllib.parse.urljoin(url, resp.getheader("Location"))
+            continue
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return resp.status, str(resp.headers.get("Content-Type", "")), body, digest
+    raise urllib.error.URLError(f"too many redirects: {url}")
 
 
 def crawl(
@@ -138,65 +256,87 @@ def crawl(
     max_pages: int,
     user_agent: str,
     cookie_header: str,
+    workers: int = 1,
 ) -> List[CrawlResult]:
     os.makedirs(out_dir, exist_ok=True)
-    queue = deque([normalize_url(start_url)])
+    workers = max(1, workers)
+    start = normalize_url(start_url)
+    queue = deque([start])
+    # Pages link to the same URLs over and over; queue each URL only once so
+    # the queue holds distinct URLs rather than one entry per link seen.
+    queued: Set[str] = {start}
     visited: Set[str] = set()
     results: List[CrawlResult] = []
-
-    while queue and len(visited) < max_pages:
-        url = queue.popleft()
-        if url in visited:
-            continue
-        if not url.startswith(allowed_prefix):
-            continue
-        visited.add(url)
-        print(f"FETCH {len(visited)}/{max_pages}: {url}", flush=True)
-
-        try:
-            status, ctype, body = fetch_url(
-                url=url,
-                timeout=timeout,
-                user_agent=user_agent,
-                cookie_header=cookie_header,
-                referer=start_url,
-            )
-        except urllib.error.HTTPError as exc:
-            print(f"WARN HTTP {exc.code}: {url}", flush=True)
-            continue
-        except urllib.error.URLError as exc:
-            print(f"WARN URL error: {url} ({exc})", flush=True)
-            continue
-
-        text = body.decode("utf-8", errors="replace")
-        local_path = safe_local_path(out_dir, allowed_prefix, url)
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        with open(local_path, "w", encoding="utf-8") as f:
-            f.write(text)
-
-        links = extract_links(text, url, allowed_prefix)
-        for link in links:
-            if link not in visited:
-                queue.append(link)
-
-        digest = hashlib.sha256(body).hexdigest()
-        results.append(
-            CrawlResult(
-                url=url,
-                status=status,
-                content_type=ctype,
-                output_path=local_path,
-                bytes=len(body),
-                sha256=digest,
-                discovered_links=len(links),
-            )
-        )
-        print(
-            f"SAVED {os.path.relpath(local_path, out_dir)} bytes={len(body)} links={len(links)}",
-            flush=True,
-        )
-        if delay > 0:
-            time.sleep(delay)
+    # Up to `workers` fetches are in flight; `delay` spaces out request starts so
+    # the request rate stays bounded while round trips overlap. Pages are saved
+    # and their links queued on this thread as each fetch completes.
+    pending: Dict[Future, str] = {}
+    next_start = 0.0
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        while pending or (queue and len(visited) < max_pages):
+            while queue and len(pending) < workers and len(visited) < max_pages and time.monotonic() >= next_start:
+                url = queue.popleft()
+                if not url.startswith(allowed_prefix):
+                    continue
+                visited.add(url)
+                print(f"FETCH {len(visited)}/{max_pages}: {url}", flush=True)
+                fut = ex.submit(
+                    fetch_url,
+                    url=url,
+                    timeout=timeout,
+                    user_agent=user_agent,
+                    cookie_header=cookie_header,
+                    referer=start_url,
+                )
+                pending[fut] = url
+                next_start = time.monotonic() + delay
+
+            wait_for: Optional[float] = None
+            if queue and len(pending) < workers and len(visited) < max_pages:
+                wait_for = max(0.0, next_start - time.monotonic())
+            if not pending:
+                time.sleep(wait_for or 0.0)
+                continue
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                url = pending.pop(fut)
+                try:
+                    status, ctype, body, digest = fut.result()
+                except urllib.error.HTTPError as exc:
+                    print(f"WARN HTTP {exc.code}: {url}", flush=True)
+                    continue
+                except urllib.error.URLError as exc:
+                    print(f"WARN URL error: {url} ({exc})", flush=True)
+                    continue
+
+                local_path = safe_local_path(out_dir, allowed_prefix, url)
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                with open(local_path, "wb") as f:
+                    f.write(body)
+
+                links = extract_links(body.decode("utf-8", errors="replace"), url, allowed_prefix)
+                for link in links:
+                    if link not in queued:
+                        queued.add(link)
+                        queue.append(link)
+
+                results.append(
+                    CrawlResult(
+                        url=url,
+                        status=status,
+                        content_type=ctype,
+                        output_path=local_path,
+                        bytes=len(body),
+                        sha256=digest,
+                        discovered_links=len(links),
+                    )
+                )
+                print(
+                    f"SAVED {os.path.relpath(local_path, out_dir)} bytes={len(body)} links={len(links)}",
+                    flush=True,
+                )
 
     return results
 
@@ -240,7 +380,8 @@ def main() -> int:
     ap.add_argument("--allowed-prefix", required=True, help="Only crawl URLs with this prefix")
     ap.add_argument("--out-dir", required=True, help="Output directory for saved HTML files")
     ap.add_argument("--timeout", type=int, default=25, help="HTTP timeout seconds")
-    ap.add_argument("--delay", type=float, default=0.5, help="Delay between requests in seconds")
+    ap.add_argument("--delay", type=float, default=0.5, help="Minimum delay between request starts in seconds")
+    ap.add_argument("--workers", type=int, default=4, help="Maximum concurrent requests")
     ap.add_argument("--max-pages", type=int, default=5000, help="Maximum pages to crawl")
     ap.add_argument("--user-agent", default=DEFAULT_UA, help="User-Agent string")
     ap.add_argument("--cookie-header", default="", help="Raw Cookie header value (useful for Cloudflare-protected sites)")
@@ -264,6 +405,7 @@ def main() -> int:
         max_pages=args.max_pages,
         user_agent=args.user_agent,
         cookie_header=args.cookie_header.strip(),
+        workers=args.workers,
     )
     manifest_path = write_manifest(os.path.abspath(os.path.expanduser(args.out_dir)), results)
     print(f"DONE: saved {len(results)} pages", flush=True)
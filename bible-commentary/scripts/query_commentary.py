@@ -11,31 +11,52 @@ import subprocess
 import sys
 from typing import Dict, List, Optional
 
-from common_db import PARSER_VERSION, connect, default_data_dir, default_index_path, get_manifest, init_schema, search_entries
+from common_db import PARSER_VERSION, SCHEMA_VERSION, connect, connect_readonly, default_data_dir, default_index_path, get_manifest, init_schema, search_entries, search_entries_text
 from common_passages import parse_passage, split_by_chapter
 from common_progress import ProgressReporter
 import build_index
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-BIBLE_TEXT_SCRIPT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "bible-text", "scripts", "bible_text.py"))
+BIBLE_TEXT_SCRIPTS = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "bible-text", "scripts"))
+
+
+def _is_locked(exc: sqlite3.OperationalError) -> bool:
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
 
 
 def _auto_bootstrap_needed(index_path: str, manifest: dict) -> bool:
     if not os.path.isfile(index_path):
         return True
     try:
-        conn = connect(index_path)
-        init_schema(conn)
-        parser_version = get_manifest(conn, "parser_version")
-        manifest_version = get_manifest(conn, "source_manifest_version")
-        conn.close()
+        conn = connect_readonly(index_path)
+        try:
+            schema_version = get_manifest(conn, "schema_version")
+            parser_version = get_manifest(conn, "parser_version")
+            manifest_version = get_manifest(conn, "source_manifest_version")
+        finally:
+            conn.close()
+        if schema_version != SCHEMA_VERSION:
+            # Written by an older release: migrate it once. A current index is
+            # only ever read here, so queries never need the write lock.
+            conn = connect(index_path)
+            try:
+                init_schema(conn)
+            finally:
+                conn.close()
         if parser_version != PARSER_VERSION:
             return True
         if manifest_version not in {str(manifest.get("manifest_version", "1")), "ai_friendly_v1"}:
             return True
         if manifest_version == "ai_friendly_v1":
             return False
+    except sqlite3.OperationalError as exc:
+        if _is_locked(exc):
+            # An index build holds the write lock; starting another bootstrap
+            # would only queue behind it. Serve the last committed index.
+            return False
+        return True
     except sqlite3.DatabaseError:
         return True
 
@@ -58,16 +79,16 @@ def _run_bootstrap(progress: ProgressReporter, refresh: bool = False) -> None:
 
 
 def _fetch_bible_text(passage: str) -> Optional[dict]:
-    if not os.path.isfile(BIBLE_TEXT_SCRIPT):
+    # The bible-text skill is optional; when it is installed alongside this one,
+    # call it in-process rather than paying for a second interpreter per query.
+    if not os.path.isfile(os.path.join(BIBLE_TEXT_SCRIPTS, "bible_text.py")):
         return None
+    if BIBLE_TEXT_SCRIPTS not in sys.path:
+        sys.path.append(BIBLE_TEXT_SCRIPTS)
     try:
-        cp = subprocess.run(
-            [sys.executable, BIBLE_TEXT_SCRIPT, passage, "--json"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return json.loads(cp.stdout)
+        import bible_text
+
+        return bible_text.lookup(passage)
     except Exception:
         return None
 
@@ -97,7 +118,7 @@ def _synthesize(results: List[dict], passage_label: str) -> str:
     )
 
 
-def query(passage_text: str, progress: ProgressReporter, as_json: bool = False) -> int:
+def query(passage_text: str, progress: ProgressReporter, as_json: bool = False, keyword: Optional[str] = None) -> int:
     manifest = build_index.load_manifest()
     index_path = os.path.expanduser(os.environ.get("BIBLE_COMMENTARY_INDEX_PATH", default_index_path()))
     auto_bootstrap = os.environ.get("BIBLE_COMMENTARY_AUTO_BOOTSTRAP", "true").lower() in {"1", "true", "yes", "on"}
@@ -116,14 +137,18 @@ def query(passage_text: str, progress: ProgressReporter, as_json: bool = False)
         print(str(exc), file=sys.stderr)
         return 1
 
-    conn = connect(index_path)
-    init_schema(conn)
+    # The bootstrap check above (or the bootstrap itself) has already brought
+    # the schema up to date, so the lookup itself only needs to read.
+    conn = connect_readonly(index_path)
     priority = _priority_map_from_env()
     max_excerpts = int(os.environ.get("BIBLE_COMMENTARY_MAX_EXCERPTS", "8"))
 
     all_results: List[dict] = []
     for ch_passage in split_by_chapter(passage):
-        chunk_results = search_entries(conn, ch_passage, priority, limit=max_excerpts)
+        if keyword:
+            chunk_results = search_entries_text(conn, ch_passage, keyword, limit=max_excerpts)
+        else:
+            chunk_results = search_entries(conn, ch_passage, priority, limit=max_excerpts)
         all_results.extend(chunk_results)
     # dedupe and sort by score
     dedup = {}
@@ -180,12 +205,13 @@ def query(passage_text: str, progress: ProgressReporter, as_json: bool = False)
 def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser(description="Query local Bible commentary index")
     ap.add_argument("passage", help="Passage reference, e.g. 'Romans 8:28-30'")
+    ap.add_argument("--keyword", help="Only return excerpts containing these words (a trailing * matches prefixes)")
     ap.add_argument("--json", action="store_true", dest="as_json", help="Emit JSON output")
     ap.add_argument("--progress", action="store_true", help="Emit progress messages")
     ap.add_argument("--json-progress", action="store_true", help="Emit progress as JSON lines")
     args = ap.parse_args(argv)
     reporter = ProgressReporter(enabled=args.progress or args.json_progress, json_mode=args.json_progress)
-    return query(args.passage, reporter, as_json=args.as_json)
+    return query(args.passage, reporter, as_json=args.as_json, keyword=args.keyword)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import build_index
+from common_db import connect
+
+
+class IncrementalBuildTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        raw = Path(self.tmp) / "raw"
+        raw.mkdir()
+        self.src = raw / "henry.txt"
+        self.source = {"commentator_key": "henry", "work_title": "Henry", "source_url": "u", "local_path": "henry.txt"}
+        env = mock.patch.dict(os.environ, {"BIBLE_COMMENTARY_DATA_DIR": self.tmp})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("BIBLE_COMMENTARY_INDEX_PATH", None)
+
+    def build(self, parse=build_index.parse_source_file):
+        manifest = {"manifest_version": "1", "sources": [self.source]}
+        # Threads instead of processes so the patched parser is the one called.
+        with mock.patch.object(build_index, "_parse_pool", lambda jobs: ThreadPoolExecutor(1)), mock.patch.object(
+            build_index, "parse_source_file", parse
+        ):
+            build_index.build_index(manifest)
+
+    def labels(self):
+        conn = connect(str(Path(self.tmp) / "index" / "commentary.sqlite"))
+        try:
+            return {r[0] for r in conn.execute("SELECT passage_label FROM entries")}
+        finally:
+            conn.close()
+
+    def test_failed_parse_is_retried_on_next_build(self):
+        self.src.write_text("Romans 8:28 All things work together.\n")
+        self.build()
+        self.assertEqual(self.labels(), {"Romans 8:28"})
+
+        # Same size, new content; the parse of it fails once.
+        self.src.write_text("Romans 8:29 Xll things work together.\n")
+        self.build(parse=mock.Mock(side_effect=RuntimeError("boom")))
+        self.assertEqual(self.labels(), {"Romans 8:28"})
+
+        os.utime(self.src, (1, 1))
+        self.build()
+        self.assertEqual(self.labels(), {"Romans 8:29"})
+
+    def test_changed_default_book_is_reparsed(self):
+        self.src.write_text("8:28 All things work together.\n")
+        self.source["default_book"] = "Romans"
+        self.build()
+        self.assertEqual(self.labels(), {"Romans 8:28"})
+
+        self.source["default_book"] = "John"
+        self.build()
+        self.assertEqual(self.labels(), {"John 8:28"})
+
+    def test_changed_default_book_is_reparsed_when_only_mtime_moved(self):
+        self.src.write_text("8:28 All things work together.\n")
+        self.source["default_book"] = "Romans"
+        self.build()
+
+        # Same bytes under a new mtime take the hash path.
+        os.utime(self.src, (1, 1))
+        self.source["default_book"] = "John"
+        self.build()
+        self.assertEqual(self.labels(), {"John 8:28"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
@@ -5,7 +6,8 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
 
-from common_db import connect, init_schema, replace_entries_for_source, search_entries, upsert_source
+from common_db import connect, connect_readonly, get_source_state, init_schema, replace_entries_for_source, score_row, search_entries, search_entries_text, set_source_stat, upsert_source
+from common_db import _STRIP_CHARS
 from common_passages import parse_passage
 
 
@@ -55,6 +57,177 @@ class DbQueryTests(unittest.TestCase):
             self.assertGreaterEqual(len(res), 2)
             self.assertEqual(res[0]["granularity"], "verse")
 
+    def test_replace_entries_swaps_rows_and_coverage(self):
+        def row(chapter):
+            return {
+                "commentator_key": "gill",
+                "work_title": "Gill",
+                "book_id": 19,  # Psalms
+                "chapter_start": chapter,
+                "verse_start": None,
+                "chapter_end": chapter,
+                "verse_end": None,
+                "granularity": "chapter",
+                "passage_label": f"Psalms {chapter}",
+                "excerpt": f"Psalm {chapter} notes",
+                "sort_chapter": chapter,
+                "sort_verse": 0,
+            }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect(str(Path(tmp) / "c.sqlite"))
+            init_schema(conn)
+            sid = upsert_source(conn, "gill", "Gill", "https://example.com", "/tmp/raw", "test", "1", None)
+            replace_entries_for_source(conn, sid, [row(1), row(1), row(2)])
+            replace_entries_for_source(conn, sid, [row(3)])
+            conn.commit()
+            entries = conn.execute("SELECT chapter_start FROM entries WHERE source_id = ?", (sid,)).fetchall()
+            coverage = conn.execute("SELECT chapter_start FROM coverage WHERE commentator_key = 'gill'").fetchall()
+            self.assertEqual([r[0] for r in entries], [3])
+            self.assertEqual([r[0] for r in coverage], [3])
+
+    def test_mixed_commentator_rows_are_rejected(self):
+        def row(key):
+            return {
+                "commentator_key": key,
+                "work_title": "Gill",
+                "book_id": 19,
+                "chapter_start": 1,
+                "chapter_end": 1,
+                "granularity": "chapter",
+                "passage_label": "Psalms 1",
+                "excerpt": "notes",
+                "sort_chapter": 1,
+                "sort_verse": 0,
+            }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect(str(Path(tmp) / "c.sqlite"))
+            init_schema(conn)
+            sid = upsert_source(conn, "gill", "Gill", "https://example.com", "/tmp/raw", "test", "1", None)
+            with self.assertRaises(ValueError):
+                replace_entries_for_source(conn, sid, [row("gill"), row("henry")])
+
+    def test_source_stat_survives_upsert_and_old_schema(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect(str(Path(tmp) / "c.sqlite"))
+            # Index created before sources carried mtime/size.
+            conn.execute(
+                "CREATE TABLE sources (id INTEGER PRIMARY KEY, commentator_key TEXT NOT NULL, work_title TEXT NOT NULL, "
+                "source_url TEXT NOT NULL, local_raw_path TEXT NOT NULL, parser_name TEXT NOT NULL, parser_version TEXT NOT NULL, "
+                "content_hash TEXT, downloaded_at TEXT NOT NULL, UNIQUE(commentator_key, work_title, local_raw_path))"
+            )
+            init_schema(conn)
+            self.assertIsNone(get_source_state(conn, "gill", "Gill", "/tmp/raw"))
+            sid = upsert_source(conn, "gill", "Gill", "https://example.com", "/tmp/raw", "test", "1", "abc")
+            set_source_stat(conn, sid, 1700000000.25, 42, "k")
+            upsert_source(conn, "gill", "Gill", "https://example.com", "/tmp/raw", "test", "1", "abc")
+            state = get_source_state(conn, "gill", "Gill", "/tmp/raw")
+            self.assertEqual(
+                (state["id"], state["mtime"], state["size"], state["parse_key"], state["content_hash"]), (sid, 1700000000.25, 42, "k", "abc")
+            )
+
+    def test_sql_ranking_matches_score_row(self):
+        def row(key, ch1, v1, ch2, v2, gran, excerpt):
+            return {
+                "commentator_key": key,
+                "work_title": key.title(),
+                "book_id": 45,  # Romans
+                "chapter_start": ch1,
+                "verse_start": v1,
+                "chapter_end": ch2,
+                "verse_end": v2,
+                "granularity": gran,
+                "passage_label": f"Romans {ch1}:{v1}-{v2}",
+                "excerpt": excerpt,
+                "sort_chapter": ch1,
+                "sort_verse": v1 or 0,
+            }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect(str(Path(tmp) / "c.sqlite"))
+            init_schema(conn)
+            for key in ("henry", "gill", "other"):
+                sid = upsert_source(conn, key, key.title(), "https://example.com", f"/tmp/{key}", "test", "1", None)
+                replace_entries_for_source(
+                    conn,
+                    sid,
+                    [
+                        row(key, 8, 28, 8, 28, "verse", "x" * 150),
+                        row(key, 8, 26, 8, 30, "range", " short\u00a0"),
+                        row(key, 8, None, 8, None, "chapter", "y" * 60),
+                        row(key, 8, 1, 9, 5, "range", "z" * 2000),
+                        row(key, 8, 0, 8, 0, "verse", "zero verse"),
+                    ],
+                )
+            conn.commit()
+            priority = {"henry": 0, "gill": 3}
+            for ref in ("Romans 8:28", "Romans 8:27-29", "Romans 8", "Romans 8-9", "Romans 8:1"):
+                p = parse_passage(ref)
+                res = search_entries(conn, p, priority, limit=50)
+                rows = conn.execute(
+                    "SELECT e.*, s.source_url, s.local_raw_path FROM entries e JOIN sources s ON s.id = e.source_id"
+                ).fetchall()
+                scored = [(score_row(r, p, priority), r) for r in rows if r["chapter_start"] <= p.chapter_end and r["chapter_end"] >= p.chapter_start]
+                expected = sorted(
+                    ((sc, r) for sc, r in scored if sc > 0),
+                    key=lambda x: (-x[0], x[1]["sort_chapter"], x[1]["sort_verse"], x[1]["id"]),
+                )
+                self.assertEqual([(r["id"], r["score"]) for r in res], [(r["id"], round(s, 4)) for s, r in expected])
+
+    def test_text_search_follows_replaced_entries(self):
+        def row(book_id, chapter, excerpt):
+            return {
+                "commentator_key": "henry",
+                "work_title": "Henry",
+                "book_id": book_id,
+                "chapter_start": chapter,
+                "verse_start": None,
+                "chapter_end": chapter,
+                "verse_end": None,
+                "granularity": "chapter",
+                "passage_label": f"Chapter {chapter}",
+                "excerpt": excerpt,
+                "sort_chapter": chapter,
+                "sort_verse": 0,
+            }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect(str(Path(tmp) / "c.sqlite"))
+            init_schema(conn)
+            sid = upsert_source(conn, "henry", "Henry", "https://example.com", "/tmp/raw", "test", "1", None)
+            replace_entries_for_source(conn, sid, [row(45, 8, "Old note on adoption")])
+            replace_entries_for_source(
+                conn,
+                sid,
+                [row(45, 8, "Predestination and glory"), row(45, 9, "Glory of Israel"), row(1, 1, "Glory in creation")],
+            )
+            conn.commit()
+            self.assertEqual(search_entries_text(conn, None, "adoption"), [])
+            res = search_entries_text(conn, parse_passage("Romans 8"), "glory")
+            self.assertEqual([r["excerpt"] for r in res], ["Predestination and glory"])
+            res = search_entries_text(conn, None, "predestin* GLORY")
+            self.assertEqual([r["excerpt"] for r in res], ["Predestination and glory"])
+            self.assertEqual(len(search_entries_text(conn, None, 'glory"')), 3)
+
+    def test_strip_chars_match_str_strip(self):
+        # The literal must track the running Python's Unicode whitespace.
+        self.assertEqual(_STRIP_CHARS, "".join(c for c in map(chr, range(0x110000)) if c.isspace()))
+
+    def test_readonly_connection_reads_but_cannot_write(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = str(Path(tmp) / "c.sqlite")
+            conn = connect(db)
+            init_schema(conn)
+            upsert_source(conn, "gill", "Gill", "https://example.com", "/tmp/raw", "test", "1", None)
+            conn.commit()
+            ro = connect_readonly(db)
+            self.assertEqual(ro.execute("SELECT commentator_key FROM sources").fetchone()["commentator_key"], "gill")
+            with self.assertRaises(sqlite3.OperationalError):
+                ro.execute("DELETE FROM sources")
+            ro.close()
+            conn.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
 
-from common_passages import parse_passage
+from common_passages import VERSE_REF_SCAN_RE, iter_verse_refs, parse_passage, scan_lines, scan_passages_in_text
 
 
 class PassageTests(unittest.TestCase):
@@ -23,6 +23,22 @@ class PassageTests(unittest.TestCase):
         self.assertTrue(p.is_chapter_only)
         self.assertEqual(p.normalized_label(), "Psalms 23")
 
+    def test_scan_lines_matches_per_line_scan(self):
+        lines = ["See John 3:16 and Rom 8:28-30", "no refs here", "verse 4:2-5:1", "Nowhere 1:1"]
+        self.assertEqual(scan_lines(lines, default_book="Ps"), [scan_passages_in_text(ln, default_book="Ps") for ln in lines])
+        self.assertEqual(scan_lines(["4:2"]), [[]])
+
+    def test_iter_verse_refs_matches_finditer(self):
+        texts = [
+            "grace abounding " * 50 + "so Romans 8:28-9:3, then 1 John 1:9.",
+            "Ps 1:2:3 and 12345:6 x8:28 Gen\t1:1-2:3456 2:3-",
+            "a, b; Rev 22:21-\nJude 1:3",
+            "Romans \uff18:\uff12\uff18 is cited, Ps \u0661\u0662:3 and 1\u0663:4",
+        ]
+        for text in texts:
+            expected = [(m.span(), m.groups()) for m in VERSE_REF_SCAN_RE.finditer(text)]
+            self.assertEqual([(m.span(), m.groups()) for m in iter_verse_refs(text)], expected)
+
 
 if __name__ == "__main__":
     unittest.main()
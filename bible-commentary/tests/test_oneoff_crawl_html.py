@@ -0,0 +1,70 @@
+import unittest
+from html.parser import HTMLParser
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from oneoff_crawl_html import _anchor_hrefs, extract_links
+
+
+class _ReferenceLinkParser(HTMLParser):
+    """The HTMLParser-based extraction _anchor_hrefs replaced."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag.lower() != "a":
+            return
+        for k, v in attrs:
+            if k.lower() == "href" and v:
+                self.links.append(v.strip())
+                break
+
+
+def _reference_hrefs(html):
+    parser = _ReferenceLinkParser()
+    parser.feed(html)
+    return parser.links
+
+
+CORPUS = [
+    '<a href="a.htm">A</a> <A HREF=\'b.htm\'>B</A> <a\nhref=c.htm>C</a>',
+    '<a href=unquoted.htm title=x>u</a><a/href=slash.htm>s</a>',
+    '<a href="">e</a><a href="" href="second.htm">d</a><a href=first.htm href=dup.htm>d</a>',
+    '<a href="?a=1&amp;b=2">q</a><a href="&#47;abs.htm">n</a><a href=" padded.htm ">p</a>',
+    '<a name=top>no href</a><a href>bare</a><a href=>empty</a><abbr href=no.htm>x</abbr>',
+    '<a data-href=no.htm href=yes.htm>d</a><a title="x href=no.htm" href=yes2.htm>t</a>',
+    '<a title="1 > 0" href=gt.htm>g</a><img alt="<a href=inalt.htm>"><a href=after.htm>',
+    "<!-- <a href=comment.htm> --><a href=live.htm><!--x--  ><a href=live2.htm>",
+    "<script>var s = '<a href=script.htm>';</script ><a href=s2.htm>"
+    "<style>a[href='<a href=style.htm>']{}</style><a href=s3.htm>",
+    '<!DOCTYPE html><?xml version="1.0"?><![CDATA[<a href="cd.htm">]]><a href=d.htm>',
+    '<!x <a href=bogus.htm>><a href=ok.htm></b <a href=endtag.htm>><a href=ok2.htm>',
+    '<a href="a"b" href="c">malformed</a><a href=z.htm>',
+]
+
+
+class AnchorHrefTests(unittest.TestCase):
+    def test_matches_htmlparser(self):
+        for html in CORPUS:
+            with self.subTest(html=html):
+                self.assertEqual(list(_anchor_hrefs(html)), _reference_hrefs(html))
+
+    def test_extract_links_resolves_filters_and_dedupes(self):
+        base = "https://example.com/gill/"
+        html = (
+            '<a href="p1.htm">1</a><a href="#top">t</a><a href="mailto:x@y">m</a>'
+            '<a href="/other/x.htm">o</a><a href="P1.htm#frag">f</a><a href="sub//p2.htm">2</a>'
+            '<a href="p1.htm">again</a><a href="HTTPS://EXAMPLE.COM/gill/p3.htm">3</a>'
+        )
+        self.assertEqual(
+            extract_links(html, base + "index.htm", base),
+            [base + "p1.htm", base + "P1.htm", base + "sub/p2.htm", base + "p3.htm"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
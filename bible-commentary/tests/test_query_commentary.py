@@ -0,0 +1,78 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from common_db import PARSER_VERSION, SCHEMA_VERSION, connect, get_manifest, init_schema, set_manifest
+from query_commentary import _auto_bootstrap_needed
+
+
+def _built_index(path: str) -> None:
+    conn = connect(path)
+    init_schema(conn)
+    set_manifest(conn, "parser_version", PARSER_VERSION)
+    set_manifest(conn, "source_manifest_version", "ai_friendly_v1")
+    conn.commit()
+    conn.close()
+
+
+class AutoBootstrapTests(unittest.TestCase):
+    def test_current_index_is_ready(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = str(Path(tmp) / "c.sqlite")
+            self.assertTrue(_auto_bootstrap_needed(db, {}))
+            _built_index(db)
+            self.assertFalse(_auto_bootstrap_needed(db, {}))
+
+    def test_older_schema_is_migrated_not_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = str(Path(tmp) / "c.sqlite")
+            _built_index(db)
+            conn = connect(db)
+            set_manifest(conn, "schema_version", "0")
+            conn.commit()
+            conn.close()
+            self.assertFalse(_auto_bootstrap_needed(db, {}))
+            conn = connect(db)
+            self.assertEqual(get_manifest(conn, "schema_version"), SCHEMA_VERSION)
+            conn.close()
+
+    def test_check_does_not_wait_on_a_running_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = str(Path(tmp) / "c.sqlite")
+            _built_index(db)
+            writer = connect(db)
+            writer.execute("BEGIN IMMEDIATE")
+            writer.execute("DELETE FROM entries")
+            try:
+                start = time.monotonic()
+                self.assertFalse(_auto_bootstrap_needed(db, {}))
+                self.assertLess(time.monotonic() - start, 1.0)
+            finally:
+                writer.rollback()
+                writer.close()
+
+    def test_locked_index_is_not_rebootstrapped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = str(Path(tmp) / "c.sqlite")
+            _built_index(db)
+            conn = connect(db)
+            set_manifest(conn, "schema_version", "0")
+            conn.commit()
+            conn.close()
+            # Older schema, so the check has to migrate, and a build holding the
+            # write lock makes that fail with "database is locked".
+            writer = connect(db)
+            writer.execute("BEGIN IMMEDIATE")
+            try:
+                self.assertFalse(_auto_bootstrap_needed(db, {}))
+            finally:
+                writer.rollback()
+                writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
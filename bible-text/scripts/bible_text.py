@@ -6,8 +6,11 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import sqlite3
 import sys
-from typing import Dict, List, Optional
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -15,7 +18,11 @@ COMMENTARY_SCRIPTS = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "bible
 if COMMENTARY_SCRIPTS not in sys.path:
     sys.path.insert(0, COMMENTARY_SCRIPTS)
 
-from common_passages import parse_osis_ref, parse_passage  # type: ignore  # noqa: E402
+from common_passages import match_book, parse_passage  # type: ignore  # noqa: E402
+
+# Bump when the verse cache layout or text cleaning changes, so existing caches
+# are rebuilt instead of served.
+VERSE_CACHE_VERSION = 1
 
 
 def discover_bible_data_dir() -> str:
@@ -174,8 +181,18 @@ def load_bible_data(path: str) -> List[dict]:
     return data
 
 
-def verse_records_for_passage(items: List[dict], query):
-    out = []
+def default_cache_dir() -> str:
+    return os.path.expanduser(os.environ.get("BIBLE_TEXT_CACHE_DIR", "~/.openclaw/data/bible-text"))
+
+
+def _iter_verses(items: List[dict], book_id: Optional[int] = None) -> Iterator[Tuple[int, str, int, int, str]]:
+    """Yield (book_id, book_name, chapter, verse, raw text) for each verse row.
+
+    Headings and malformed refs are skipped. With ``book_id`` set, rows from
+    other books are dropped before chapter and verse are parsed.
+    """
+    # Refs look like "kjv:Genesis:1:1"; each distinct book name is resolved once.
+    books: Dict[str, Optional[Tuple[int, str, str]]] = {}
     for item in items:
         ref = item.get("r")
         text = item.get("t", "")
@@ -183,31 +200,44 @@ def verse_records_for_passage(items: List[dict], query):
             continue
         if item.get("h"):  # section heading/title rows
             continue
-        try:
-            verse_p = parse_osis_ref(ref)
-        except Exception:
+        parts = ref.split(":")
+        if len(parts) < 4:
             continue
-        if verse_p.book_id != query.book_id:
+        book_raw = parts[1]
+        if book_raw in books:
+            book = books[book_raw]
+        else:
+            book = books[book_raw] = match_book(book_raw)
+        if book is None or (book_id is not None and book[0] != book_id):
             continue
-        if not (query.chapter_start <= verse_p.chapter_start <= query.chapter_end):
+        try:
+            ch = int(parts[2])
+            vv = int(parts[3])
+        except ValueError:
+            continue
+        yield book[0], book[2], ch, vv, text
+
+
+def verse_records_for_passage(items: List[dict], query):
+    out = []
+    for _, book_name, ch, vv, text in _iter_verses(items, query.book_id):
+        if not (query.chapter_start <= ch <= query.chapter_end):
             continue
         if query.verse_start is not None and query.verse_end is not None:
-            if verse_p.chapter_start == query.chapter_start == query.chapter_end:
-                if not (query.verse_start <= (verse_p.verse_start or 0) <= query.verse_end):
+            if ch == query.chapter_start == query.chapter_end:
+                if not (query.verse_start <= vv <= query.verse_end):
                     continue
             elif query.chapter_start != query.chapter_end:
                 # Cross-chapter request; apply per-edge filtering
-                ch = verse_p.chapter_start
-                vv = verse_p.verse_start or 0
                 if ch == query.chapter_start and vv < query.verse_start:
                     continue
                 if ch == query.chapter_end and vv > query.verse_end:
                     continue
         out.append(
             {
-                "book": verse_p.book_name,
-                "chapter": verse_p.chapter_start,
-                "verse": verse_p.verse_start,
+                "book": book_name,
+                "chapter": ch,
+                "verse": vv,
                 "text": _clean_bible_data_text(text),
             }
         )
@@ -215,6 +245,133 @@ def verse_records_for_passage(items: List[dict], query):
     return out
 
 
+def ensure_verse_cache(json_path: str, cache_dir: Optional[str] = None) -> str:
+    """Return the path of a SQLite copy of ``json_path``'s verses.
+
+    The copy is rebuilt when the JSON file's path, mtime or size no longer match
+    the ones it was built from, or when VERSE_CACHE_VERSION changes.
+    """
+    st = os.stat(json_path)
+    source = f"{os.path.abspath(json_path)}:{st.st_mtime_ns}:{st.st_size}"
+    cache_dir = cache_dir or default_cache_dir()
+    name = os.path.splitext(os.path.basename(json_path))[0].lower()
+    cache_path = os.path.join(cache_dir, f"{name}.sqlite")
+    if os.path.isfile(cache_path):
+        try:
+            conn = sqlite3.connect(f"{Path(cache_path).as_uri()}?mode=ro", uri=True)
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+            finally:
+                conn.close()
+            if version == VERSE_CACHE_VERSION and row is not None and row[0] == source:
+                return cache_path
+        except sqlite3.DatabaseError:
+            pass
+
+    items = load_bible_data(json_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Build beside the final path and swap it in, so a concurrent lookup never
+    # opens a half-written cache.
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".sqlite", dir=cache_dir)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute(
+                "CREATE TABLE verses (book_id INTEGER NOT NULL, book TEXT NOT NULL, "
+                "chapter INTEGER NOT NULL, verse INTEGER NOT NULL, text TEXT NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT INTO verses VALUES (?, ?, ?, ?, ?)",
+                ((b, n, ch, vv, _clean_bible_data_text(t)) for b, n, ch, vv, t in _iter_verses(items)),
+            )
+            conn.execute("CREATE INDEX verses_ref ON verses(book_id, chapter, verse)")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("INSERT INTO meta VALUES ('source', ?)", (source,))
+            conn.execute(f"PRAGMA user_version = {VERSE_CACHE_VERSION}")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return cache_path
+
+
+def _query_verse_cache(cache_path: str, query) -> List[dict]:
+    # Same selection as verse_records_for_passage, as one indexed range scan.
+    sql = "SELECT book, chapter, verse, text FROM verses WHERE book_id = ? AND chapter BETWEEN ? AND ?"
+    params = [query.book_id, query.chapter_start, query.chapter_end]
+    if query.verse_start is not None and query.verse_end is not None:
+        if query.chapter_start == query.chapter_end:
+            sql += " AND verse BETWEEN ? AND ?"
+            params += [query.verse_start, query.verse_end]
+        else:
+            sql += " AND NOT (chapter = ? AND verse < ?) AND NOT (chapter = ? AND verse > ?)"
+            params += [query.chapter_start, query.verse_start, query.chapter_end, query.verse_end]
+    sql += " ORDER BY chapter, verse, rowid"
+    conn = sqlite3.connect(f"{Path(cache_path).as_uri()}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [{"book": b, "chapter": ch, "verse": vv, "text": t} for b, ch, vv, t in rows]
+
+
+def lookup_verses(json_path: str, query) -> List[dict]:
+    """Verses of ``query`` from a translation file, served from the verse cache."""
+    try:
+        cache_path = ensure_verse_cache(json_path)
+    except (OSError, sqlite3.Error):
+        # No usable cache location (e.g. read-only home); scan the JSON instead.
+        return verse_records_for_passage(load_bible_data(json_path), query)
+    return _query_verse_cache(cache_path, query)
+
+
+def resolve_data_dir() -> str:
+    data_dir = os.path.expanduser(os.environ.get("BIBLE_TEXT_DATA_DIR", ""))
+    return data_dir or discover_bible_data_dir()
+
+
+def lookup(
+    passage: str,
+    data_dir: Optional[str] = None,
+    translation: Optional[str] = None,
+    strict: Optional[bool] = None,
+) -> dict:
+    """Look up ``passage`` and return the payload printed by ``--json``.
+
+    Settings left as None come from the BIBLE_TEXT_* environment variables, as
+    for the command line. Raises if the data, translation or verses are missing.
+    """
+    if data_dir is None:
+        data_dir = resolve_data_dir()
+    if not data_dir:
+        raise FileNotFoundError("Bible data not found. Set BIBLE_TEXT_DATA_DIR")
+    if translation is None:
+        translation = os.environ.get("BIBLE_TEXT_TRANSLATION", "KJV")
+    if strict is None:
+        strict = os.environ.get("BIBLE_TEXT_STRICT", "false").lower() in {"1", "true", "yes", "on"}
+
+    query = parse_passage(passage, strict=strict)
+    path = find_translation_file(data_dir, translation)
+    verses = lookup_verses(path, query)
+    if not verses:
+        raise LookupError(f"No verses found for {query.normalized_label()} in {translation}")
+    return {
+        "query": passage,
+        "normalized_passage": query.normalized_label(),
+        "translation": translation,
+        "verses": verses,
+        "text": " ".join(f"{v['verse']}. {v['text']}" for v in verses),
+    }
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Lookup Bible passage from local bible-data files")
     ap.add_argument("passage", nargs="?", help="Passage reference, e.g. 'Romans 8:28-30'")
@@ -234,11 +391,7 @@ def main() -> int:
         print("Passage is required (or use --setup).", file=sys.stderr)
         return 2
 
-    data_dir = os.path.expanduser(os.environ.get("BIBLE_TEXT_DATA_DIR", ""))
-    if not data_dir:
-        data_dir = discover_bible_data_dir()
-    translation = os.environ.get("BIBLE_TEXT_TRANSLATION", "KJV")
-    strict = os.environ.get("BIBLE_TEXT_STRICT", "false").lower() in {"1", "true", "yes", "on"}
+    data_dir = resolve_data_dir()
     if not data_dir:
         print(
             "Bible data not found. Set BIBLE_TEXT_DATA_DIR or clone bible-data to "
@@ -248,32 +401,17 @@ def main() -> int:
         return 2
 
     try:
-        query = parse_passage(args.passage, strict=strict)
-        path = find_translation_file(data_dir, translation)
-        items = load_bible_data(path)
-        verses = verse_records_for_passage(items, query)
+        payload = lookup(args.passage, data_dir=data_dir)
     except Exception as exc:
         print(str(exc), file=sys.stderr)
         return 1
 
-    if not verses:
-        print(f"No verses found for {query.normalized_label()} in {translation}", file=sys.stderr)
-        return 1
-
-    payload = {
-        "query": args.passage,
-        "normalized_passage": query.normalized_label(),
-        "translation": translation,
-        "verses": verses,
-        "text": " ".join(f"{v['verse']}. {v['text']}" for v in verses),
-    }
-
     if args.as_json:
         print(json.dumps(payload, indent=2))
         return 0
 
-    print(f"{payload['normalized_passage']} ({translation})")
-    for v in verses:
+    print(f"{payload['normalized_passage']} ({payload['translation']})")
+    for v in payload["verses"]:
         print(f"{v['chapter']}:{v['verse']} {v['text']}")
     return 0
 